@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def tanh_mapping(s: np.ndarray, R: float = 0.5):
+    """
+    Tanh stretching of the unit interval [0, 1], refined towards both ends (exercises 7 and 8).
+
+    Args:
+        s (np.ndarray): Points of the unit interval.
+        R (float): Stretching parameter, the pipe radius of exercise 7 (0 < R < 1).
+
+    Returns:
+        np.ndarray: Stretched points g(s), with g(0) = 0 and g(1) = 1.
+    """
+    if not 0 < R < 1:
+        raise ValueError("R must be between 0 and 1.")
+    stretch = 2.0 * np.arctanh(R)
+    return (np.tanh(stretch * (2.0 * s - 1.0)) / np.tanh(stretch) + 1.0) / 2.0
+
+
+def grid_mapping(grid, stretch: float = 0.5):
+    """
+    Return the function mapping the unit interval [0, 1] onto the grid shape.
+
+    Args:
+        grid: 'uniform' (exercises 1-3 and 5), 'quadratic' (exercise 4), 'tanh' (exercises 7 and 8)
+              or a callable g(s) with g(0) = 0 and g(1) = 1.
+        stretch (float): Stretching parameter R of the 'tanh' grid (see tanh_mapping).
+
+    Returns:
+        callable: Vectorized mapping g(s).
+    """
+    if callable(grid):
+        return grid
+    if grid == 'uniform':
+        return lambda s: s
+    if grid == 'quadratic':
+        return lambda s: s**2
+    if grid == 'tanh':
+        return lambda s: tanh_mapping(s, stretch)
+    raise ValueError("grid must be 'uniform', 'quadratic', 'tanh' or a callable.")
+
+
+def grid_points(n: int, xbounds, grid='uniform', stretch: float = 0.5):
+    """
+    Generate the grid of n points between xbounds used by the exercises.
+
+    Args:
+        n (int): Number of grid points.
+        xbounds: Grid limits [a, b].
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+        stretch (float): Stretching parameter R of the 'tanh' grid (see tanh_mapping).
+
+    Returns:
+        np.ndarray: Grid points.
+    """
+    return xbounds[0] + grid_mapping(grid, stretch)(np.linspace(0.0, 1.0, n)) * (xbounds[1] - xbounds[0])
+
+
+def tanh_grid(R: float, N: int):
+    """
+    Non-uniform grid on [-R, R] that is refined towards the pipe wall (exercises 7 and 8).
+
+    Args:
+        R (float): Radius of the pipe (m).
+        N (int): Number of grid points.
+
+    Returns:
+        np.ndarray: Grid points (m).
+    """
+    return grid_points(N, [-R, R], 'tanh', stretch=R)
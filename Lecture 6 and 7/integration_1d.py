@@ -0,0 +1,557 @@
+from functools import lru_cache
+
+import numpy as np
+
+from grids import grid_mapping
+
+
+def river_bed_depth(x: np.ndarray):
+    """
+    River bed depth profile used in exercises 1-4.
+
+    Args:
+        x (np.ndarray): Locations across the river span (m).
+
+    Returns:
+        np.ndarray: Depth y = 5 + 10 sin(x) at each location (m).
+    """
+    return 5.0 + 10.0 * np.sin(x)
+
+
+def sweep_integration_areas(f, xbounds, n_values, grid='uniform', max_points: int = 2**22):
+    """
+    Evaluate the vectorized integration methods 6-9 for a whole range of n at once.
+
+    The grids of all n are concatenated into one ragged array and every method is reduced
+    per grid with np.add.reduceat, so there is no Python loop over n. The n values are
+    processed in batches of at most max_points samples to bound the memory use.
+
+    Args:
+        f: Vectorized integrand f(x), e.g. river_bed_depth.
+        xbounds: Integration limits [a, b].
+        n_values: Number of grid points of each case (every n must be >= 2).
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+        max_points (int): Maximum number of samples held in memory per batch.
+
+    Returns:
+        tuple: areas (np.ndarray of shape (n_methods, len(n_values))), labels (list of method names).
+               Uniform grids give methods 6, 7, 8 and 9; other grids give methods 6, 8 and 9
+               (method 7 does not make sense on a non-uniform grid).
+    """
+    n_values = np.asarray(n_values, dtype=np.int64)
+    if n_values.ndim != 1:
+        raise ValueError("n_values must be a 1D array.")
+    if np.any(n_values < 2):
+        raise ValueError("Every n must be at least 2.")
+    if max_points < 2:
+        raise ValueError("max_points must be at least 2.")
+
+    uniform = (not callable(grid)) and grid == 'uniform'
+    mapping = grid_mapping(grid)
+    labels = ['Method 6', 'Method 7', 'Method 8', 'Method 9'] if uniform else ['Method 6', 'Method 8', 'Method 9']
+    areas = np.zeros((len(labels), len(n_values)))
+
+    a, b = float(xbounds[0]), float(xbounds[1])
+
+    start = 0
+    while start < len(n_values):
+        # Take as many cases as fit in max_points (always at least one)
+        counts = np.cumsum(n_values[start:])
+        stop = start + max(1, int(np.searchsorted(counts, max_points, side='right')))
+        n = n_values[start:stop]
+
+        # Concatenated ragged grid: seg_start[k] is the index of the first point of case k
+        total = int(np.sum(n))
+        seg_start = np.concatenate(([0], np.cumsum(n)[:-1]))
+        local = np.arange(total) - np.repeat(seg_start, n)   # point index inside its own grid
+        s = local / np.repeat(n - 1, n)
+        x = a + mapping(s) * (b - a)
+        y = f(x)
+
+        # Interval widths, with the interval joining two different grids set to zero
+        dx = np.diff(x)
+        dx[seg_start[1:] - 1] = 0.0
+
+        # Method 6 -- midpoint rule
+        area_6 = np.add.reduceat(dx * f((x[1:] + x[:-1]) / 2.0), seg_start)
+
+        # Method 8 -- per-point weights, half the distance to each neighbour
+        weights = np.zeros(total)
+        weights[:-1] += dx / 2.0
+        weights[1:] += dx / 2.0
+        area_8 = np.add.reduceat(weights * y, seg_start)
+
+        # Method 9 -- trapezoidal rule
+        area_9 = np.add.reduceat(dx * (y[1:] + y[:-1]) / 2.0, seg_start)
+
+        if uniform:
+            # Method 7 -- left-sum with constant dx
+            area_7 = (b - a) / (n - 1) * np.add.reduceat(y, seg_start)
+            areas[:, start:stop] = [area_6, area_7, area_8, area_9]
+        else:
+            areas[:, start:stop] = [area_6, area_8, area_9]
+
+        start = stop
+
+    return areas, labels
+
+
+def sweep_integration_errors(f, xbounds, n_values, area_exact: float, grid='uniform', max_points: int = 2**22):
+    """
+    Compute the absolute error of methods 6-9 for a whole range of n in one vectorized pass.
+
+    Args:
+        f: Vectorized integrand f(x).
+        xbounds: Integration limits [a, b].
+        n_values: Number of grid points of each case.
+        area_exact (float): Exact value of the integral.
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+        max_points (int): Maximum number of samples held in memory per batch.
+
+    Returns:
+        tuple: errors (np.ndarray of shape (n_methods, len(n_values))), labels (list of method names).
+    """
+    areas, labels = sweep_integration_areas(f, xbounds, n_values, grid, max_points)
+    return np.abs(areas - area_exact), labels
+
+
+def romberg_integrate(f, xbounds, tol: float = 1e-12, max_levels: int = 25):
+    """
+    Integrate f with Romberg's method, i.e. trapezoidal rule (method 9) plus Richardson extrapolation.
+
+    Each level halves the grid spacing and evaluates f only at the new midpoints, so every
+    earlier sample is reused. The trapezoid errors are removed term by term (h^2, h^4, ...)
+    and the refinement stops once two successive extrapolated values differ by less than tol.
+
+    Args:
+        f: Vectorized integrand f(x).
+        xbounds: Integration limits [a, b].
+        tol (float): Absolute tolerance on the area.
+        max_levels (int): Maximum number of grid halvings.
+
+    Returns:
+        tuple: area (float), error_estimate (float), n_evaluations (int).
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance must be a positive value.")
+    if max_levels < 1:
+        raise ValueError("max_levels must be at least 1.")
+
+    a, b = float(xbounds[0]), float(xbounds[1])
+    h = b - a
+    y_ends = f(np.array([a, b]))
+    n_evaluations = 2
+
+    # Trapezoidal rule with a single interval
+    previous_row = [h * (y_ends[0] + y_ends[1]) / 2.0]
+    error_estimate = np.inf
+
+    for level in range(1, max_levels + 1):
+        # Trapezoidal rule at half the spacing: only the new midpoints are evaluated
+        n_new = 2**(level - 1)
+        midpoints = a + h * (np.arange(n_new) + 0.5)
+        y_mid = f(midpoints)
+        n_evaluations += n_new
+        h = h / 2.0
+
+        row = [previous_row[0] / 2.0 + h * np.sum(y_mid)]
+
+        # Richardson extrapolation of the leading error terms
+        for k in range(1, level + 1):
+            factor = 4.0**k
+            row.append(row[k - 1] + (row[k - 1] - previous_row[k - 1]) / (factor - 1.0))
+
+        error_estimate = abs(row[-1] - previous_row[-1])
+        previous_row = row
+        if error_estimate < tol:
+            break
+
+    return previous_row[-1], error_estimate, n_evaluations
+
+
+def _compensated_add(total: float, compensation: float, value: float):
+    """
+    Add value to a running sum using Neumaier's compensated (Kahan-Babuska) summation.
+
+    Args:
+        total (float): Running sum.
+        compensation (float): Accumulated rounding error of the running sum.
+        value (float): Value to add.
+
+    Returns:
+        tuple: Updated total and compensation. The compensated sum is total + compensation.
+    """
+    new_total = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - new_total) + value
+    else:
+        compensation += (value - new_total) + total
+    return new_total, compensation
+
+
+def iterate_npy_chunks(x_path: str, y_path: str, chunk_size: int = 2**20):
+    """
+    Yield (x, y) chunks from a pair of .npy files without loading them into memory.
+
+    Args:
+        x_path (str): Path of the .npy file with the sample locations.
+        y_path (str): Path of the .npy file with the sampled values.
+        chunk_size (int): Number of samples per chunk.
+
+    Yields:
+        tuple: x and y chunks (read-only views of the memory-mapped files).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    x = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    if x.ndim != 1 or x.shape != y.shape:
+        raise ValueError("x and y must be 1D arrays of the same length.")
+
+    for start in range(0, len(x), chunk_size):
+        yield x[start:start + chunk_size], y[start:start + chunk_size]
+
+
+def stream_integrate(chunks, f=None):
+    """
+    Integrate sampled data that arrives in chunks, e.g. from a generator or iterate_npy_chunks.
+
+    The last sample of each chunk is carried over to the next one, so the result does not
+    depend on where the data is split. The grid may be non-uniform. Each chunk is summed
+    pairwise by np.sum and the chunk totals are accumulated with compensated summation.
+
+    Args:
+        chunks: Iterable of (x, y) pairs of 1D arrays, in increasing order of x.
+        f: Optional vectorized function f(x) used for the midpoint rule (method 6).
+
+    Returns:
+        tuple: area_6 (midpoint rule, nan if f is None), area_8 (per-point weights),
+               area_9 (trapezoidal rule).
+    """
+    sums = {'6': (0.0, 0.0), '8': (0.0, 0.0), '9': (0.0, 0.0)}
+
+    x_last = None               # Sample carried over from the previous chunk
+    y_last = None
+    weight_last = 0.0           # Weight of the carried sample from the interval on its left
+
+    for x, y in chunks:
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.ndim != 1 or x.shape != y.shape:
+            raise ValueError("Each chunk must hold 1D x and y arrays of the same length.")
+        if len(x) == 0:
+            continue
+
+        if x_last is not None:
+            x = np.concatenate(([x_last], x))
+            y = np.concatenate(([y_last], y))
+
+        dx = np.diff(x)
+        if len(dx) > 0:
+            # Method 6 -- midpoint rule
+            if f is not None:
+                sums['6'] = _compensated_add(*sums['6'], np.sum(dx * f((x[1:] + x[:-1]) / 2.0)))
+
+            # Method 8 -- all points except the last one have both neighbours available now
+            weights = np.empty(len(x) - 1)
+            weights[0] = weight_last + dx[0] / 2.0
+            weights[1:] = (dx[:-1] + dx[1:]) / 2.0
+            sums['8'] = _compensated_add(*sums['8'], np.sum(weights * y[:-1]))
+            weight_last = dx[-1] / 2.0
+
+            # Method 9 -- trapezoidal rule
+            sums['9'] = _compensated_add(*sums['9'], np.sum(dx * (y[1:] + y[:-1]) / 2.0))
+
+        x_last = x[-1]
+        y_last = y[-1]
+
+    if x_last is None:
+        raise ValueError("No samples were provided.")
+
+    # The last sample only has the interval on its left
+    sums['8'] = _compensated_add(*sums['8'], weight_last * y_last)
+
+    area_6 = sum(sums['6']) if f is not None else np.nan
+    return area_6, sum(sums['8']), sum(sums['9'])
+
+
+def simpson_weights(x: np.ndarray):
+    """
+    Quadrature weights of the composite Simpson rule on a uniform or non-uniform grid.
+
+    Pairs of intervals are integrated with the quadratic through their three points. If the
+    number of intervals is odd, the last interval uses the quadratic through the last three points.
+
+    Args:
+        x (np.ndarray): Monotonically increasing grid with at least 3 points.
+
+    Returns:
+        np.ndarray: Weights w such that the integral of y is approximately np.sum(w * y).
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim != 1 or len(x) < 3:
+        raise ValueError("x must be a 1D array with at least 3 points.")
+    h = np.diff(x)
+    if np.any(h <= 0):
+        raise ValueError("x must be strictly increasing.")
+
+    n_intervals = len(h)
+    n_pairs = n_intervals // 2
+    weights = np.zeros(len(x))
+
+    # Simpson rule on each pair of intervals (h0, h1)
+    h0 = h[0:2 * n_pairs:2]
+    h1 = h[1:2 * n_pairs:2]
+    hsum = h0 + h1
+    np.add.at(weights, np.arange(0, 2 * n_pairs, 2), hsum / 6.0 * (2.0 - h1 / h0))
+    weights[1:2 * n_pairs:2] += hsum / 6.0 * hsum**2 / (h0 * h1)
+    np.add.at(weights, np.arange(2, 2 * n_pairs + 1, 2), hsum / 6.0 * (2.0 - h0 / h1))
+
+    # Odd number of intervals: integrate the last interval with the quadratic through the last three points
+    if n_intervals % 2 == 1:
+        h0, h1 = h[-2], h[-1]
+        weights[-1] += (2.0 * h1**2 + 3.0 * h0 * h1) / (6.0 * (h0 + h1))
+        weights[-2] += (h1**2 + 3.0 * h0 * h1) / (6.0 * h0)
+        weights[-3] -= h1**3 / (6.0 * h0 * (h0 + h1))
+
+    return weights
+
+
+def simpson_integrate(x: np.ndarray, y: np.ndarray):
+    """
+    Integrate sampled data with the composite Simpson rule.
+
+    Args:
+        x (np.ndarray): Monotonically increasing grid with at least 3 points.
+        y (np.ndarray): Samples on the grid; the last axis must match x.
+
+    Returns:
+        float or np.ndarray: Integral of y along its last axis.
+    """
+    return np.asarray(y) @ simpson_weights(x)
+
+
+def _read_only(array: np.ndarray):
+    """Mark an array returned from a cache as read-only, so that callers cannot modify the cached copy."""
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=128)
+def simpson_rule(n: int, a: float, b: float, grid='uniform'):
+    """
+    Nodes and weights of the composite Simpson rule, cached per (n, interval, grid).
+
+    Args:
+        n (int): Number of grid points (at least 3).
+        a (float): Lower integration limit.
+        b (float): Upper integration limit.
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+
+    Returns:
+        tuple: nodes and weights (read-only np.ndarray).
+    """
+    s = np.linspace(0.0, 1.0, n)
+    nodes = a + grid_mapping(grid)(s) * (b - a)
+    return _read_only(nodes), _read_only(simpson_weights(nodes))
+
+
+@lru_cache(maxsize=128)
+def gauss_legendre_rule(order: int, n_intervals: int, a: float, b: float, grid='uniform'):
+    """
+    Nodes and weights of the composite Gauss-Legendre rule, cached per (order, n, interval, grid).
+
+    The interval [a, b] is split into n_intervals panels whose edges follow the chosen grid,
+    and each panel is integrated with an order-point Gauss-Legendre rule (exact for polynomials
+    of degree 2*order - 1).
+
+    Args:
+        order (int): Number of Gauss points per panel.
+        n_intervals (int): Number of panels.
+        a (float): Lower integration limit.
+        b (float): Upper integration limit.
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+
+    Returns:
+        tuple: nodes and weights (read-only np.ndarray of length order * n_intervals).
+    """
+    if order < 1:
+        raise ValueError("order must be a positive integer.")
+    if n_intervals < 1:
+        raise ValueError("n_intervals must be a positive integer.")
+
+    edges = a + grid_mapping(grid)(np.linspace(0.0, 1.0, n_intervals + 1)) * (b - a)
+    reference_nodes, reference_weights = np.polynomial.legendre.leggauss(order)
+
+    # Map the reference rule on [-1, 1] onto each panel
+    half_width = np.diff(edges)[:, np.newaxis] / 2.0
+    centre = (edges[1:] + edges[:-1])[:, np.newaxis] / 2.0
+    nodes = centre + half_width * reference_nodes
+    weights = half_width * reference_weights
+    return _read_only(nodes.ravel()), _read_only(weights.ravel())
+
+
+def composite_simpson(f, xbounds, n: int, grid='uniform'):
+    """
+    Integrate f with the composite Simpson rule using cached nodes and weights.
+
+    Args:
+        f: Vectorized integrand f(x).
+        xbounds: Integration limits [a, b].
+        n (int): Number of grid points (at least 3).
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+
+    Returns:
+        float: Approximation of the integral.
+    """
+    nodes, weights = simpson_rule(int(n), float(xbounds[0]), float(xbounds[1]), grid)
+    return weights @ f(nodes)
+
+
+def composite_gauss_legendre(f, xbounds, n_intervals: int, order: int = 5, grid='uniform'):
+    """
+    Integrate f with the composite Gauss-Legendre rule using cached nodes and weights.
+
+    Args:
+        f: Vectorized integrand f(x).
+        xbounds: Integration limits [a, b].
+        n_intervals (int): Number of panels.
+        order (int): Number of Gauss points per panel.
+        grid: 'uniform', 'quadratic', 'tanh' or a callable g(s) mapping [0, 1] onto [0, 1].
+
+    Returns:
+        float: Approximation of the integral.
+    """
+    nodes, weights = gauss_legendre_rule(int(order), int(n_intervals), float(xbounds[0]), float(xbounds[1]), grid)
+    return weights @ f(nodes)
+
+
+def trapezoid_weights(x: np.ndarray):
+    """
+    Per-point weights of the trapezoidal rule on any monotone grid (the dx vector of method 8).
+
+    Args:
+        x (np.ndarray): Monotonically increasing grid with at least 2 points.
+
+    Returns:
+        np.ndarray: Weights w such that the integral of y is approximately np.sum(w * y).
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim != 1 or len(x) < 2:
+        raise ValueError("x must be a 1D array with at least 2 points.")
+
+    dx = np.diff(x)
+    weights = np.zeros(len(x))
+    weights[:-1] += dx / 2.0
+    weights[1:] += dx / 2.0
+    return weights
+
+
+def grid_weights(x: np.ndarray, rule: str = 'trapezoid'):
+    """
+    Build the quadrature weight vector of a grid once, to integrate many integrands on it.
+
+    Args:
+        x (np.ndarray): Monotonically increasing grid.
+        rule (str): 'trapezoid' (methods 8 and 9) or 'simpson'.
+
+    Returns:
+        np.ndarray: Read-only weight vector of the same length as x.
+    """
+    if rule == 'trapezoid':
+        weights = trapezoid_weights(x)
+    elif rule == 'simpson':
+        weights = simpson_weights(x)
+    else:
+        raise ValueError("rule must be 'trapezoid' or 'simpson'.")
+    return _read_only(weights)
+
+
+def integrate_with_weights(weights: np.ndarray, y: np.ndarray):
+    """
+    Integrate one or many integrands sampled on the same grid with precomputed weights.
+
+    Args:
+        weights (np.ndarray): Weight vector from grid_weights.
+        y (np.ndarray): Samples of shape (n,) or a stack of integrands of shape (n_profiles, n).
+
+    Returns:
+        float or np.ndarray: Integral of each integrand, computed as a single matrix-vector product.
+    """
+    y = np.asarray(y)
+    if y.shape[-1] != len(weights):
+        raise ValueError("The last axis of y must match the length of the weight vector.")
+    return y @ weights
+
+
+def adaptive_integrate(f, xbounds, tol: float = 1e-10, max_levels: int = 50):
+    """
+    Integrate f with adaptive Simpson quadrature, refining only where the local error is large.
+
+    All intervals that still need refinement are processed together, so f is called once per
+    refinement level with a vector of new points. For each interval the Simpson rule on the
+    whole interval is compared with the Simpson rule on its two halves; the interval is accepted
+    if the difference is below its share of tol (proportional to its width) and split otherwise.
+    The samples of an interval are passed on to its halves, so only two new points per interval
+    are evaluated at each level. No exact answer is needed.
+
+    Args:
+        f: Vectorized integrand f(x).
+        xbounds: Integration limits [a, b].
+        tol (float): Absolute tolerance on the area.
+        max_levels (int): Maximum number of interval halvings.
+
+    Returns:
+        tuple: area (float), error_estimate (float, sum of the local error estimates; conservative
+               since the accepted values are also Richardson-corrected), n_evaluations (int).
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance must be a positive value.")
+    if max_levels < 1:
+        raise ValueError("max_levels must be at least 1.")
+
+    a, b = float(xbounds[0]), float(xbounds[1])
+    length = b - a
+
+    # Active intervals: left end, width and samples at the left end, midpoint and right end
+    left = np.array([a])
+    width = np.array([length])
+    samples = f(np.array([a, a + length / 2.0, b]))
+    f_left, f_mid, f_right = samples[0:1], samples[1:2], samples[2:3]
+    n_evaluations = 3
+
+    area, compensation = 0.0, 0.0
+    error_estimate = 0.0
+
+    for level in range(max_levels):
+        # Evaluate the quarter points of all active intervals at once
+        quarter_points = np.concatenate((left + width / 4.0, left + 3.0 * width / 4.0))
+        f_quarters = f(quarter_points)
+        n_evaluations += len(quarter_points)
+        f_quarter_1, f_quarter_3 = np.split(f_quarters, 2)
+
+        coarse = width / 6.0 * (f_left + 4.0 * f_mid + f_right)
+        fine = width / 12.0 * (f_left + 4.0 * f_quarter_1 + 2.0 * f_mid + 4.0 * f_quarter_3 + f_right)
+        local_error = np.abs(fine - coarse) / 15.0
+
+        accept = local_error <= tol * width / length
+        if level == max_levels - 1:
+            accept[:] = True
+
+        # Accepted intervals: Richardson-corrected Simpson value
+        area, compensation = _compensated_add(area, compensation, np.sum(fine[accept] + (fine[accept] - coarse[accept]) / 15.0))
+        error_estimate += np.sum(local_error[accept])
+
+        # Split the remaining intervals into halves, reusing their samples
+        refine = ~accept
+        if not np.any(refine):
+            break
+        half = width[refine] / 2.0
+        left = np.concatenate((left[refine], left[refine] + half))
+        width = np.concatenate((half, half))
+        f_left, f_mid, f_right = (np.concatenate((f_left[refine], f_mid[refine])),
+                                  np.concatenate((f_quarter_1[refine], f_quarter_3[refine])),
+                                  np.concatenate((f_mid[refine], f_right[refine])))
+
+    return area + compensation, error_estimate, n_evaluations
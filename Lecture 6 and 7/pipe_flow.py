@@ -0,0 +1,800 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from time import perf_counter
+
+import numpy as np
+from scipy import ndimage, stats
+from scipy.interpolate import RegularGridInterpolator
+
+from grids import grid_points, tanh_grid
+
+
+def hagen_poiseuille_velocity(r: np.ndarray, R: float, u_max: float):
+    """
+    Velocity of the laminar (Hagen-Poiseuille) flow through a circular pipe.
+
+    Args:
+        r (np.ndarray): Radial distance from the pipe centre (m).
+        R (float): Radius of the pipe (m).
+        u_max (float): Velocity at the pipe centre (m/s).
+
+    Returns:
+        np.ndarray: Velocity u = u_max * (1 - (r/R)^2) (m/s). Values for r > R are not masked.
+    """
+    return u_max * (1.0 - (r / R)**2)
+
+
+def masked_cell_sums(dx: np.ndarray, dy: np.ndarray, mask: np.ndarray, u: np.ndarray):
+    """
+    Masked area and flux on a tensor-product grid, contracted directly with the 1D cell widths.
+
+    Equivalent to np.sum(cell_area[mask]) and np.sum(cell_area[mask] * u[mask]) with
+    cell_area = dx[:, np.newaxis] * dy[np.newaxis, :], but neither the cell_area matrix nor
+    the boolean-indexed copies are created: the sums are sum_i dx_i sum_j mask_ij dy_j and
+    sum_i dx_i sum_j mask_ij u_ij dy_j.
+
+    Args:
+        dx (np.ndarray): Cell widths along x, shape (nx,).
+        dy (np.ndarray): Cell widths along y, shape (ny,).
+        mask (np.ndarray): Boolean array of shape (nx, ny), True for the cells to include, or the
+                           fraction of each cell inside the domain (see circle_cell_fractions).
+        u (np.ndarray): Cell values of shape (nx, ny), e.g. u[:-1, :-1].
+
+    Returns:
+        tuple: area, total_flow.
+    """
+    if mask.shape != (len(dx), len(dy)) or u.shape != mask.shape:
+        raise ValueError("mask and u must have shape (len(dx), len(dy)).")
+
+    area = dx @ (mask @ dy)
+    total_flow = dx @ np.einsum('ij,ij,j->i', mask, u, dy)
+    return area, total_flow
+
+
+def _disk_quadrant_area(a: np.ndarray, b: np.ndarray, R: float):
+    """
+    Exact area of the intersection of the disk r <= R with the quarter plane {x >= a, y >= b}.
+
+    Args:
+        a (np.ndarray): Lower x-limits of the quarter planes.
+        b (np.ndarray): Lower y-limits of the quarter planes.
+        R (float): Radius of the disk centred at the origin.
+
+    Returns:
+        np.ndarray: Intersection areas.
+    """
+    def antiderivative(t):
+        # Integral of sqrt(R^2 - t^2) dt
+        return (t * np.sqrt(np.maximum(R**2 - t**2, 0.0)) + R**2 * np.arcsin(np.clip(t / R, -1.0, 1.0))) / 2.0
+
+    b_abs = np.abs(b)
+    half_chord = np.sqrt(np.maximum(R**2 - b_abs**2, 0.0))
+    lower = np.clip(a, -half_chord, half_chord)
+    area_above = antiderivative(half_chord) - antiderivative(lower) - b_abs * (half_chord - lower)
+
+    # For b < 0 use the symmetry y -> -y: area right of a minus the part below b
+    area_right = 2.0 * (antiderivative(R) - antiderivative(np.clip(a, -R, R)))
+    return np.where(b >= 0, area_above, area_right - area_above)
+
+
+def circle_cell_fractions(x: np.ndarray, y: np.ndarray, R: float):
+    """
+    Exact fraction of each grid cell that lies inside the circle r <= R (cut-cell weights).
+
+    The area of the disk inside each cell is obtained from the disk areas of the quarter planes
+    at its four corners, so the disk is evaluated once per grid node.
+
+    Args:
+        x (np.ndarray): Grid points along x, shape (nx + 1,).
+        y (np.ndarray): Grid points along y, shape (ny + 1,).
+        R (float): Radius of the circle centred at the origin.
+
+    Returns:
+        np.ndarray: Fractions between 0 and 1 of shape (nx, ny).
+    """
+    if R <= 0:
+        raise ValueError("Radius must be a positive value.")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    corner_area = _disk_quadrant_area(x[:, np.newaxis], y[np.newaxis, :], R)
+    cell_inside = corner_area[:-1, :-1] - corner_area[1:, :-1] - corner_area[:-1, 1:] + corner_area[1:, 1:]
+    cell_area = np.diff(x)[:, np.newaxis] * np.diff(y)[np.newaxis, :]
+    return np.clip(cell_inside / cell_area, 0.0, 1.0)
+
+
+def sdf_cell_fractions(x: np.ndarray, y: np.ndarray, sdf, n_sub: int = 8):
+    """
+    Fraction of each grid cell inside a shape given by a signed-distance function (negative inside).
+
+    Cells far from the boundary (|sdf| at the centre larger than half the cell diagonal) are
+    fully inside or outside. Only the cut cells are sampled on an n_sub x n_sub sub-grid.
+
+    Args:
+        x (np.ndarray): Grid points along x, shape (nx + 1,).
+        y (np.ndarray): Grid points along y, shape (ny + 1,).
+        sdf: Vectorized signed-distance function sdf(x, y), e.g. np.sqrt(x**2 + y**2) - R.
+        n_sub (int): Number of sub-samples per cell and direction for the cut cells.
+
+    Returns:
+        np.ndarray: Fractions between 0 and 1 of shape (nx, ny).
+    """
+    if n_sub < 1:
+        raise ValueError("n_sub must be a positive integer.")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx = np.diff(x)
+    dy = np.diff(y)
+
+    x_centre = (x[1:] + x[:-1]) / 2.0
+    y_centre = (y[1:] + y[:-1]) / 2.0
+    distance = sdf(x_centre[:, np.newaxis], y_centre[np.newaxis, :])
+    half_diagonal = np.sqrt(dx[:, np.newaxis]**2 + dy[np.newaxis, :]**2) / 2.0
+
+    fractions = (distance < 0).astype(float)
+    i, j = np.nonzero(np.abs(distance) < half_diagonal)
+
+    # Sub-sample the cut cells at the centres of an n_sub x n_sub sub-grid
+    offsets = (np.arange(n_sub) + 0.5) / n_sub
+    x_sub = x[i, np.newaxis, np.newaxis] + dx[i, np.newaxis, np.newaxis] * offsets[:, np.newaxis]
+    y_sub = y[j, np.newaxis, np.newaxis] + dy[j, np.newaxis, np.newaxis] * offsets[np.newaxis, :]
+    fractions[i, j] = np.mean(sdf(x_sub, y_sub) < 0, axis=(1, 2))
+    return fractions
+
+
+def cut_cell_average_velocity(x: np.ndarray, y: np.ndarray, R: float, u_max: float, fractions=None):
+    """
+    Average pipe velocity with cut-cell weights instead of the staircase mask r <= R.
+
+    Each cell is weighted by its area inside the pipe and the velocity is taken at the cell centre.
+
+    Args:
+        x (np.ndarray): Grid points along x (uniform or not).
+        y (np.ndarray): Grid points along y (uniform or not).
+        R (float): Radius of the pipe (m).
+        u_max (float): Velocity at the pipe centre (m/s).
+        fractions: Optional precomputed cell fractions (default: circle_cell_fractions(x, y, R)).
+
+    Returns:
+        tuple: v_avg_numerical (m/s), area (m^2), total_flow (m^3/s).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if fractions is None:
+        fractions = circle_cell_fractions(x, y, R)
+
+    x_centre = (x[1:] + x[:-1]) / 2.0
+    y_centre = (y[1:] + y[:-1]) / 2.0
+    r = np.sqrt(x_centre[:, np.newaxis]**2 + y_centre[np.newaxis, :]**2)
+    u = hagen_poiseuille_velocity(r, R, u_max)
+
+    area, total_flow = masked_cell_sums(np.diff(x), np.diff(y), fractions, u)
+    return total_flow / area, area, total_flow
+
+
+class CompactField:
+    """
+    Compact storage of a field on the grid points inside a circular domain.
+
+    Only the in-domain points are kept, as flat arrays of their coordinates, area weights and
+    indices into the flattened grid (the index map). Fields are evaluated, averaged and compared
+    directly on these flat arrays; scatter puts them back on the full grid for plotting.
+
+    Attributes:
+        shape (tuple): Shape (len(x), len(y)) of the full grid.
+        index (np.ndarray): Flat indices of the in-domain points in the full grid.
+        x, y (np.ndarray): Coordinates of the in-domain points.
+        weights (np.ndarray): Area weight of each in-domain point.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, R: float, cell_based: bool = True):
+        """
+        Build the index map of the grid points with r <= R.
+
+        Args:
+            x (np.ndarray): Grid points along x (uniform or not).
+            y (np.ndarray): Grid points along y (uniform or not).
+            R (float): Radius of the domain (m).
+            cell_based (bool): If True, each point carries the area of the cell to its upper right
+                               (method 3 of exercise 7); otherwise the constant dx*dy of a uniform
+                               grid (method 1 of exercise 5), which raises ValueError on a non-uniform grid.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if R <= 0:
+            raise ValueError("Radius must be a positive value.")
+
+        self.shape = (len(x), len(y))
+        i, j = np.nonzero(x[:, np.newaxis]**2 + y[np.newaxis, :]**2 <= R**2)
+        self.index = np.ravel_multi_index((i, j), self.shape)
+        self.x = x[i]
+        self.y = y[j]
+
+        if cell_based:
+            # Points on the last row or column have no cell of their own
+            dx = np.append(np.diff(x), 0.0)
+            dy = np.append(np.diff(y), 0.0)
+            self.weights = dx[i] * dy[j]
+        else:
+            dx = (x[-1] - x[0]) / (len(x) - 1)
+            dy = (y[-1] - y[0]) / (len(y) - 1)
+            if not (np.allclose(np.diff(x), dx) and np.allclose(np.diff(y), dy)):
+                raise ValueError("cell_based=False requires a uniform grid.")
+            self.weights = np.full(len(i), dx * dy)
+        self.area = np.sum(self.weights)
+
+    def gather(self, field: np.ndarray):
+        """Extract the in-domain values from a field on the full grid."""
+        return np.asarray(field).ravel()[self.index]
+
+    def scatter(self, values: np.ndarray, fill_value: float = np.nan):
+        """Put in-domain values back on the full grid (e.g. for plotting), filling the rest with fill_value."""
+        field = np.full(self.shape, fill_value)
+        field.ravel()[self.index] = values
+        return field
+
+    def flux(self, values: np.ndarray):
+        """Integral of the in-domain values over the domain."""
+        return self.weights @ values
+
+    def average(self, values: np.ndarray):
+        """Area-weighted average of the in-domain values."""
+        return self.flux(values) / self.area
+
+    def error_norm(self, values: np.ndarray, reference: np.ndarray, order: float = 2):
+        """
+        Area-weighted norm of the difference between two sets of in-domain values.
+
+        Args:
+            values (np.ndarray): In-domain values.
+            reference (np.ndarray): Reference in-domain values (e.g. the exact solution).
+            order (float): 1 (mean absolute error), 2 (root mean square error), any p >= 1,
+                           or np.inf (maximum absolute error).
+
+        Returns:
+            float: (sum_k w_k |e_k|^p / area)^(1/p) with e = values - reference.
+        """
+        if order < 1:
+            raise ValueError("order must be at least 1.")
+        error = np.abs(np.subtract(values, reference))
+        if np.isinf(order):
+            return np.max(error)
+        if order == 1:
+            return self.average(error)
+        return self.average(error**order)**(1.0 / order)
+
+
+def _axis_interpolation_weights(source: np.ndarray, target: np.ndarray, method: str):
+    """
+    Stencil indices and weights for interpolating along one axis of a non-uniform rectilinear grid.
+
+    Args:
+        source (np.ndarray): Strictly increasing source grid points.
+        target (np.ndarray): Target points.
+        method (str): 'linear' (2-point stencil) or 'cubic' (4-point Lagrange stencil).
+
+    Returns:
+        tuple: index and weights arrays of shape (len(target), stencil size). Targets outside the
+               source grid get nan weights.
+    """
+    n_stencil = {'linear': 2, 'cubic': 4}[method]
+    if len(source) < n_stencil:
+        raise ValueError(f"At least {n_stencil} source points are needed for {method} interpolation.")
+
+    # Interval containing each target, and the first point of a stencil centred on it
+    interval = np.clip(np.searchsorted(source, target, side='right') - 1, 0, len(source) - 2)
+    first = np.clip(interval - (n_stencil // 2 - 1), 0, len(source) - n_stencil)
+    index = first[:, np.newaxis] + np.arange(n_stencil)
+
+    # Lagrange basis polynomials of the stencil points evaluated at the targets
+    nodes = source[index]
+    weights = np.ones_like(nodes)
+    for k in range(n_stencil):
+        for m in range(n_stencil):
+            if m != k:
+                weights[:, k] *= (target - nodes[:, m]) / (nodes[:, k] - nodes[:, m])
+
+    tolerance = 1e-12 * (source[-1] - source[0])
+    outside = (target < source[0] - tolerance) | (target > source[-1] + tolerance)
+    weights[outside] = np.nan
+    return index, weights
+
+
+@lru_cache(maxsize=32)
+def _cached_interpolation_weights(x_source: bytes, y_source: bytes, x_target: bytes, y_target: bytes, method: str):
+    """Interpolation stencils for a source/target grid pair, cached on the raw bytes of the grids."""
+    stencils = []
+    for source, target in ((x_source, x_target), (y_source, y_target)):
+        index, weights = _axis_interpolation_weights(np.frombuffer(source), np.frombuffer(target), method)
+        index.setflags(write=False)
+        weights.setflags(write=False)
+        stencils += [index, weights]
+    return tuple(stencils)
+
+
+def interpolate_rectilinear(x_source: np.ndarray, y_source: np.ndarray, u: np.ndarray,
+                            x_target: np.ndarray, y_target: np.ndarray, method: str = 'linear'):
+    """
+    Interpolate a field from one rectilinear (possibly non-uniform) grid onto another.
+
+    A replacement for scipy.interpolate.griddata when the source grid is already rectilinear:
+    the interpolation is a tensor product of 1D stencils, so no triangulation is needed. The
+    stencil indices and weights are cached per source/target grid pair, so interpolating new
+    fields or time steps on the same grids is only a gather and a weighted sum.
+
+    Args:
+        x_source (np.ndarray): Strictly increasing source grid points along x.
+        y_source (np.ndarray): Strictly increasing source grid points along y.
+        u (np.ndarray): Field of shape (..., len(x_source), len(y_source)); leading axes (e.g. time) are kept.
+        x_target (np.ndarray): Target grid points along x.
+        y_target (np.ndarray): Target grid points along y.
+        method (str): 'linear' (bilinear) or 'cubic' (bicubic Lagrange).
+
+    Returns:
+        np.ndarray: Field of shape (..., len(x_target), len(y_target)), nan outside the source grid.
+    """
+    if method not in ('linear', 'cubic'):
+        raise ValueError("method must be 'linear' or 'cubic'.")
+    u = np.asarray(u, dtype=float)
+    if u.shape[-2:] != (len(x_source), len(y_source)):
+        raise ValueError("The last two axes of u must match the source grid.")
+
+    grids = [np.ascontiguousarray(grid, dtype=float).tobytes() for grid in (x_source, y_source, x_target, y_target)]
+    index_x, weights_x, index_y, weights_y = _cached_interpolation_weights(*grids, method)
+
+    # Interpolate along x, then along y
+    u_x = np.einsum('ak,...akj->...aj', weights_x, u[..., index_x, :])
+    return np.einsum('bk,...abk->...ab', weights_y, u_x[..., index_y])
+
+
+def pipe_flow_row_blocks(x: np.ndarray, y: np.ndarray, R: float, u_max: float, max_memory: int = 2**27):
+    """
+    Area and total flow through the pipe, computed in blocks of grid rows without a full meshgrid.
+
+    This is method 3 of exercise 7 (cell areas dx*dy, velocity at the lower-left corner of each
+    cell, cells with r <= R), evaluated by broadcasting a block of x values against the 1D y
+    vector. Only block-sized temporaries are allocated, so the peak memory stays close to
+    max_memory however large the grid is.
+
+    Args:
+        x (np.ndarray): Grid points along x (uniform or not).
+        y (np.ndarray): Grid points along y (uniform or not).
+        R (float): Radius of the pipe (m).
+        u_max (float): Velocity at the pipe centre (m/s).
+        max_memory (int): Approximate peak memory of the temporaries in bytes.
+
+    Returns:
+        tuple: area (m^2), total_flow (m^3/s).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.ndim != 1 or y.ndim != 1 or len(x) < 2 or len(y) < 2:
+        raise ValueError("x and y must be 1D arrays with at least 2 points.")
+
+    dx = np.diff(x)
+    dy = np.diff(y)
+    x_cells = x[:-1]            # lower-left corners of the cells
+    y_cells = y[:-1]
+
+    # Three float64 buffers (r^2, u and the mask as 0.0/1.0) are allocated once and reused for
+    # every block; a float mask avoids the float copy that mask @ dy makes of a boolean mask
+    bytes_per_row = 3 * 8 * len(y_cells)
+    block_rows = min(len(dx), max(1, int(max_memory // bytes_per_row)))
+    r_squared_buffer = np.empty((block_rows, len(y_cells)))
+    u_buffer = np.empty_like(r_squared_buffer)
+    mask_buffer = np.empty_like(r_squared_buffer)
+    y_squared = y_cells**2
+
+    area = 0.0
+    total_flow = 0.0
+    for start in range(0, len(dx), block_rows):
+        x_block = x_cells[start:start + block_rows, np.newaxis]
+        r_squared = np.add(x_block**2, y_squared, out=r_squared_buffer[:len(x_block)])
+        u = np.multiply(r_squared, -u_max / R**2, out=u_buffer[:len(x_block)])
+        u += u_max
+        mask = np.less_equal(r_squared, R**2, out=mask_buffer[:len(x_block)])
+
+        block_area, block_flow = masked_cell_sums(dx[start:start + block_rows], dy, mask, u)
+        area += block_area
+        total_flow += block_flow
+
+    return area, total_flow
+
+
+@lru_cache(maxsize=64)
+def pipe_geometry(R: float, Nx: int, Ny: int):
+    """
+    Grid and unit-profile average velocity of the pipe, cached per (R, Nx, Ny).
+
+    The numerical average velocity is linear in u_max, so it is computed once for u_max = 1
+    and only scaled afterwards. It is evaluated in row blocks (pipe_flow_row_blocks), so even
+    very large grids never hold a full 2D array. The least recently used geometries are evicted
+    from the cache.
+
+    Args:
+        R (float): Radius of the pipe (m).
+        Nx (int): Number of grid points along x.
+        Ny (int): Number of grid points along y.
+
+    Returns:
+        tuple: x, y (read-only 1D grids) and unit_average (float, average velocity for u_max = 1).
+    """
+    if R <= 0:
+        raise ValueError("Radius must be a positive value.")
+    if Nx < 2 or Ny < 2:
+        raise ValueError("Nx and Ny must be at least 2.")
+
+    x = tanh_grid(R, Nx)
+    y = tanh_grid(R, Ny)
+    area, total_flow = pipe_flow_row_blocks(x, y, R, 1.0)
+
+    x.setflags(write=False)
+    y.setflags(write=False)
+    return x, y, total_flow / area
+
+
+def compute_avg_velocity_value(mu: float, dpdx: float, R: float, Nx: int, Ny: int):
+    """
+    Compute the average velocity through a circular pipe on the tanh-stretched grid of exercise 8.
+
+    This is the numerical part of compute_avg_velocity in solution_exercise_8.py without any
+    printing or plotting, so it can be called many times, e.g. by sweep_avg_velocity. The
+    geometry comes from the pipe_geometry cache, so a new mu or dpdx costs one multiplication.
+
+    Args:
+        mu (float): Dynamic viscosity (Pa s).
+        dpdx (float): Pressure gradient (Pa/m).
+        R (float): Radius of the pipe (m).
+        Nx (int): Number of grid points along x.
+        Ny (int): Number of grid points along y.
+
+    Returns:
+        tuple: v_avg_numerical (float), v_avg_theory (float), both in m/s.
+    """
+    if mu <= 0:
+        raise ValueError("Viscosity must be a positive value.")
+
+    u_max = -dpdx * R**2 / (4 * mu)    # Maximum velocity at the center
+    unit_average = pipe_geometry(float(R), int(Nx), int(Ny))[2]
+    return u_max * unit_average, u_max / 2.0
+
+
+@lru_cache(maxsize=32)
+def polar_rule(R: float, n_r: int, n_theta: int):
+    """
+    Nodes and weights of a polar quadrature rule on the disk r <= R, cached per (R, n_r, n_theta).
+
+    A Gauss-Legendre rule is used in r (including the Jacobian r) and the periodic trapezoidal
+    rule, which is spectrally accurate for smooth periodic functions, in theta.
+
+    Args:
+        R (float): Radius of the disk (m).
+        n_r (int): Number of Gauss points in r.
+        n_theta (int): Number of equally spaced points in theta.
+
+    Returns:
+        tuple: x, y (node coordinates) and weights (summing to the disk area pi R^2), as read-only 1D arrays.
+    """
+    if R <= 0:
+        raise ValueError("Radius must be a positive value.")
+    if n_r < 1 or n_theta < 1:
+        raise ValueError("n_r and n_theta must be positive integers.")
+
+    reference_nodes, reference_weights = np.polynomial.legendre.leggauss(n_r)
+    r = R * (reference_nodes + 1.0) / 2.0
+    weights_r = R / 2.0 * reference_weights * r          # dA = r dr dtheta
+    theta = 2.0 * np.pi * np.arange(n_theta) / n_theta
+    weights_theta = np.full(n_theta, 2.0 * np.pi / n_theta)
+
+    x = (r[:, np.newaxis] * np.cos(theta)).ravel()
+    y = (r[:, np.newaxis] * np.sin(theta)).ravel()
+    weights = (weights_r[:, np.newaxis] * weights_theta).ravel()
+    for array in (x, y, weights):
+        array.setflags(write=False)
+    return x, y, weights
+
+
+def polar_average(field, R: float, n_r: int = 8, n_theta: int = 16):
+    """
+    Average of a field over the disk r <= R with the polar quadrature rule.
+
+    For smooth fields the error decreases exponentially with n_r and n_theta, e.g. the
+    Hagen-Poiseuille profile is integrated exactly with n_r = 2 and n_theta = 1.
+
+    Args:
+        field: Vectorized function field(x, y), e.g. the velocity.
+        R (float): Radius of the disk (m).
+        n_r (int): Number of Gauss points in r.
+        n_theta (int): Number of equally spaced points in theta.
+
+    Returns:
+        float: Area-weighted average of the field.
+    """
+    x, y, weights = polar_rule(float(R), int(n_r), int(n_theta))
+    return weights @ field(x, y) / np.sum(weights)
+
+
+def polar_average_from_grid(x: np.ndarray, y: np.ndarray, u: np.ndarray, R: float, n_r: int = 8,
+                            n_theta: int = 16, method: str = 'linear'):
+    """
+    Average of a field given on a Cartesian grid (e.g. from exercises 5, 7 or 8) with the polar quadrature rule.
+
+    The field is interpolated from the rectilinear grid onto the polar nodes, so the accuracy is
+    limited by the interpolation rather than by the staircase boundary r <= R. The field may be nan
+    outside the disk (as in the plotting code of exercises 7 and 8): non-finite values are replaced
+    by the nearest finite grid value before interpolating, so the stencils of the nodes next to the
+    wall stay defined.
+
+    Args:
+        x (np.ndarray): Grid points along x (uniform or not), covering [-R, R].
+        y (np.ndarray): Grid points along y (uniform or not), covering [-R, R].
+        u (np.ndarray): Field of shape (len(x), len(y)).
+        R (float): Radius of the disk (m).
+        n_r (int): Number of Gauss points in r.
+        n_theta (int): Number of equally spaced points in theta.
+        method (str): Interpolation method of RegularGridInterpolator ('linear', or 'cubic', which
+                      fits a spline to the whole field on every call and is much slower on large grids).
+
+    Returns:
+        float: Area-weighted average of the field.
+    """
+    u = np.asarray(u, dtype=float)
+    finite = np.isfinite(u)
+    if not np.any(finite):
+        raise ValueError("The field has no finite values.")
+    if not np.all(finite):
+        nearest = ndimage.distance_transform_edt(~finite, return_distances=False, return_indices=True)
+        u = u[tuple(nearest)]
+
+    interpolator = RegularGridInterpolator((x, y), u, method=method)
+    return polar_average(lambda xp, yp: interpolator(np.column_stack((xp, yp))), R, n_r, n_theta)
+
+
+def polar_avg_velocity(mu: float, dpdx: float, R: float, n_r: int = 8, n_theta: int = 16):
+    """
+    Average velocity through a circular pipe with the polar quadrature rule instead of a Cartesian grid.
+
+    Args:
+        mu (float): Dynamic viscosity (Pa s).
+        dpdx (float): Pressure gradient (Pa/m).
+        R (float): Radius of the pipe (m).
+        n_r (int): Number of Gauss points in r.
+        n_theta (int): Number of equally spaced points in theta.
+
+    Returns:
+        tuple: v_avg_numerical (float), v_avg_theory (float), both in m/s.
+    """
+    if mu <= 0:
+        raise ValueError("Viscosity must be a positive value.")
+
+    u_max = -dpdx * R**2 / (4 * mu)    # Maximum velocity at the center
+    velocity = lambda x, y: hagen_poiseuille_velocity(np.sqrt(x**2 + y**2), R, u_max)
+    return polar_average(velocity, R, n_r, n_theta), u_max / 2.0
+
+
+SWEEP_DTYPE = np.dtype([('mu', float), ('dpdx', float), ('R', float), ('Nx', int), ('Ny', int),
+                        ('v_avg_numerical', float), ('v_avg_theory', float)])
+
+
+def _avg_velocity_case(case):
+    """Worker of sweep_avg_velocity: evaluate one (mu, dpdx, R, Nx, Ny) case."""
+    mu, dpdx, R, Nx, Ny = case
+    return compute_avg_velocity_value(mu, dpdx, R, int(Nx), int(Ny))
+
+
+def sweep_avg_velocity(cases, max_workers=None, chunksize: int = 16):
+    """
+    Compute the average pipe velocity for many (mu, dpdx, R, Nx, Ny) cases on a process pool.
+
+    On platforms that start worker processes by spawning (Windows, macOS), call this function
+    from inside an ``if __name__ == '__main__':`` block.
+
+    Args:
+        cases: Sequence of (mu, dpdx, R, Nx, Ny) tuples, or an array of shape (n_cases, 5).
+        max_workers: Number of worker processes (None uses all CPUs, 1 runs serially in this process).
+        chunksize (int): Number of cases sent to a worker at once.
+
+    Returns:
+        np.ndarray: Structured array of dtype SWEEP_DTYPE with the inputs and results of every case.
+    """
+    cases = [tuple(case) for case in cases]
+    if any(len(case) != 5 for case in cases):
+        raise ValueError("Each case must be a (mu, dpdx, R, Nx, Ny) tuple.")
+
+    # Send cases with the same geometry to the workers together, so they hit the pipe_geometry cache
+    order = sorted(range(len(cases)), key=lambda i: cases[i][2:])
+    sorted_cases = [cases[i] for i in order]
+
+    if max_workers == 1:
+        results = list(map(_avg_velocity_case, sorted_cases))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_avg_velocity_case, sorted_cases, chunksize=chunksize))
+
+    table = np.zeros(len(cases), dtype=SWEEP_DTYPE)
+    for i, result in zip(order, results):
+        table[i] = cases[i] + result
+    return table
+
+
+def avg_velocity_mean(N: int, R: float, u_max: float, grid: str = 'uniform'):
+    """
+    Average velocity as np.mean(u[r <= R]) on an N x N grid (methods 1 and 2 of exercise 5, method 1 of exercise 7).
+
+    Returns:
+        float: Numerical average velocity (m/s).
+    """
+    x = grid_points(N, [-R, R], grid, stretch=R)   # 'uniform' (exercise 5) or 'tanh' (exercise 7)
+    r = np.sqrt(x[:, np.newaxis]**2 + x[np.newaxis, :]**2)
+    return np.mean(hagen_poiseuille_velocity(r[r <= R], R, u_max))
+
+
+def avg_velocity_cells(N: int, R: float, u_max: float, grid: str = 'tanh'):
+    """
+    Average velocity with cell areas dx*dy on an N x N grid (method 3 of exercise 7).
+
+    Returns:
+        float: Numerical average velocity (m/s).
+    """
+    x = grid_points(N, [-R, R], grid, stretch=R)   # 'uniform' (exercise 5) or 'tanh' (exercise 7)
+    area, total_flow = pipe_flow_row_blocks(x, x, R, u_max)
+    return total_flow / area
+
+
+def avg_velocity_interpolated(N: int, R: float, u_max: float, grid: str = 'tanh'):
+    """
+    Average velocity after bilinear interpolation onto a uniform N x N grid (method 4 of exercise 7).
+
+    Returns:
+        float: Numerical average velocity (m/s).
+    """
+    x = grid_points(N, [-R, R], grid, stretch=R)   # 'uniform' (exercise 5) or 'tanh' (exercise 7)
+    u = hagen_poiseuille_velocity(np.sqrt(x[:, np.newaxis]**2 + x[np.newaxis, :]**2), R, u_max)
+    x1 = np.linspace(-R, R, N)
+    r1 = np.sqrt(x1[:, np.newaxis]**2 + x1[np.newaxis, :]**2)
+    u1 = interpolate_rectilinear(x, x, u, x1, x1)
+    return np.mean(u1[r1 <= R])
+
+
+def _convergence_case(case):
+    """Worker of run_convergence_study: evaluate one (method index, method, N) case and time it."""
+    k, method, N = case
+    start = perf_counter()
+    value = method(N)
+    return k, N, value, perf_counter() - start
+
+
+def _convergence_chunk(chunk):
+    """Worker of run_convergence_study: evaluate a chunk of cases in one task."""
+    return [_convergence_case(case) for case in chunk]
+
+
+def run_convergence_study(methods, resolutions, exact: float, max_workers=None, chunksize: int = 4):
+    """
+    Run a convergence study of several methods over a resolution schedule on a process pool.
+
+    Every (method, resolution) pair is an independent case. The cases are sent to the workers
+    in chunks, largest resolutions first so that the slowest cases do not end up last. The
+    chunks are interleaved (chunk i holds cases i, i + n_chunks, ...), so every chunk mixes
+    large and small resolutions instead of grouping the most expensive cases on one worker.
+    On platforms that start worker processes by spawning (Windows, macOS), call this function
+    from inside an ``if __name__ == '__main__':`` block.
+
+    Args:
+        methods: List of functions method(N) returning the numerical value at resolution N. They must
+                 be picklable, e.g. functools.partial(avg_velocity_cells, R=0.5, u_max=6.25).
+        resolutions: Resolutions N to evaluate (without duplicates).
+        exact (float): Exact value used to compute the errors.
+        max_workers: Number of worker processes (None uses all CPUs, 1 runs serially in this process).
+        chunksize (int): Number of cases sent to a worker at once.
+
+    Returns:
+        tuple: errors, timings (np.ndarray of shape (len(methods), len(resolutions)), absolute errors
+               and run times in seconds), rates (np.ndarray of len(methods), observed orders of
+               convergence from a least-squares fit of log(error) against log(N)).
+    """
+    resolutions = np.asarray(resolutions, dtype=int)
+    if len(np.unique(resolutions)) != len(resolutions):
+        raise ValueError("Resolutions must not contain duplicates.")
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer.")
+    position = {N: i for i, N in enumerate(resolutions)}
+
+    cases = [(k, method, int(N)) for N in sorted(resolutions, reverse=True) for k, method in enumerate(methods)]
+    if max_workers == 1:
+        results = list(map(_convergence_case, cases))
+    else:
+        n_chunks = -(-len(cases) // chunksize)
+        chunks = [cases[i::n_chunks] for i in range(n_chunks)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = [result for chunk in executor.map(_convergence_chunk, chunks) for result in chunk]
+
+    errors = np.zeros((len(methods), len(resolutions)))
+    timings = np.zeros((len(methods), len(resolutions)))
+    for k, N, value, elapsed in results:
+        errors[k, position[N]] = abs(value - exact)
+        timings[k, position[N]] = elapsed
+
+    # Observed order of convergence: error ~ C N^(-rate)
+    rates = np.full(len(methods), np.nan)
+    for k in range(len(methods)):
+        valid = errors[k] > 0
+        if np.count_nonzero(valid) >= 2:
+            rates[k] = -np.polyfit(np.log(resolutions[valid]), np.log(errors[k, valid]), 1)[0]
+    return errors, timings, rates
+
+
+def qmc_integrate_2d(indicator, integrand, bounds, rtol: float = 1e-4, method: str = 'sobol',
+                     batch_size: int = 4096, n_replicates: int = 8, max_points: int = 2**26,
+                     confidence: float = 0.95, seed=None):
+    """
+    Estimate the area of a 2D domain and the integral (flux) of a field over it with randomized quasi-Monte Carlo.
+
+    Points are drawn in batches from n_replicates independently scrambled Sobol or Halton sequences
+    on the bounding box. The indicator and the integrand are evaluated on each batch with vectorized
+    operations and the running sums are updated. The spread of the replicate estimates gives a
+    confidence interval, and the sampling stops as soon as the relative half-widths of both the
+    area and the flux are below rtol. The cost depends on the required precision only, not on a grid size.
+
+    Args:
+        indicator: Function indicator(x, y) returning True inside the domain (e.g. r <= R).
+        integrand: Function integrand(x, y) returning the field to integrate (e.g. the velocity u).
+        bounds: Bounding box [[x_min, x_max], [y_min, y_max]] of the domain.
+        rtol (float): Target relative half-width of the confidence intervals.
+        method (str): 'sobol' or 'halton'.
+        batch_size (int): Points per replicate and batch (a power of 2 for Sobol).
+        n_replicates (int): Number of independently scrambled sequences (at least 2).
+        max_points (int): Maximum total number of points per replicate.
+        confidence (float): Confidence level of the intervals.
+        seed: Seed of the random scrambling.
+
+    Returns:
+        tuple: area (float), flux (float), area_halfwidth (float), flux_halfwidth (float),
+               n_points (int, total number of points evaluated).
+    """
+    if rtol <= 0:
+        raise ValueError("rtol must be a positive value.")
+    if n_replicates < 2:
+        raise ValueError("At least two replicates are needed for a confidence interval.")
+    if method == 'sobol':
+        if batch_size < 1 or batch_size & (batch_size - 1) != 0:
+            raise ValueError("batch_size must be a power of 2 for Sobol sequences.")
+        engine_class = stats.qmc.Sobol
+    elif method == 'halton':
+        engine_class = stats.qmc.Halton
+    else:
+        raise ValueError("method must be 'sobol' or 'halton'.")
+
+    bounds = np.asarray(bounds, dtype=float)
+    lower, upper = bounds[:, 0], bounds[:, 1]
+    box_area = np.prod(upper - lower)
+
+    seeds = np.random.SeedSequence(seed).spawn(n_replicates)
+    engines = [engine_class(d=2, scramble=True, seed=np.random.default_rng(s)) for s in seeds]
+    t_factor = stats.t.ppf(0.5 + confidence / 2.0, n_replicates - 1)
+
+    inside_count = np.zeros(n_replicates)
+    flux_sum = np.zeros(n_replicates)
+    n_per_replicate = 0
+
+    while True:
+        for k, engine in enumerate(engines):
+            points = stats.qmc.scale(engine.random(batch_size), lower, upper)
+            x, y = points[:, 0], points[:, 1]
+            inside = indicator(x, y)
+            inside_count[k] += np.count_nonzero(inside)
+            flux_sum[k] += np.sum(integrand(x[inside], y[inside]))
+        n_per_replicate += batch_size
+
+        # Replicate estimates and their confidence intervals
+        areas = box_area * inside_count / n_per_replicate
+        fluxes = box_area * flux_sum / n_per_replicate
+        area, flux = np.mean(areas), np.mean(fluxes)
+        area_halfwidth = t_factor * np.std(areas, ddof=1) / np.sqrt(n_replicates)
+        flux_halfwidth = t_factor * np.std(fluxes, ddof=1) / np.sqrt(n_replicates)
+
+        converged = area_halfwidth <= rtol * abs(area) and flux_halfwidth <= rtol * abs(flux)
+        if converged or n_per_replicate + batch_size > max_points:
+            break
+
+    return area, flux, area_halfwidth, flux_halfwidth, n_per_replicate * n_replicates
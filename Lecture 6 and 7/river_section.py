@@ -0,0 +1,401 @@
+import glob
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class LazyNpz(Mapping):
+    """
+    Read-only, lazy view of the arrays in a .npz file (e.g. the y, z and u of cross_section.npz).
+
+    Nothing is read when the file is opened. An array is only mapped when it is first accessed:
+    members stored without compression are memory-mapped directly inside the .npz file, and
+    compressed members are decompressed in chunks into a temporary file that is then memory-mapped.
+    Either way only the parts of an array that are actually used are read from disk.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 2**24):
+        """
+        Open the .npz file and read its table of contents.
+
+        Args:
+            path (str): Path of the .npz file.
+            chunk_size (int): Chunk size in bytes used to decompress compressed members.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        with zipfile.ZipFile(path) as archive:
+            self._members = {info.filename[:-4]: info for info in archive.infolist() if info.filename.endswith('.npy')}
+        self._arrays = {}
+
+    def __getitem__(self, name: str):
+        if name not in self._arrays:
+            if name not in self._members:
+                raise KeyError(f"{name} is not in {self.path}")
+            info = self._members[name]
+            if info.compress_type == zipfile.ZIP_STORED:
+                self._arrays[name] = self._map_stored(info)
+            else:
+                self._arrays[name] = self._map_compressed(info)
+        return self._arrays[name]
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+    def _map_stored(self, info: zipfile.ZipInfo):
+        """Memory-map an uncompressed member in place."""
+        with open(self.path, 'rb') as file:
+            # The data follows the 30-byte local file header, the file name and the extra field
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            shape, fortran_order, dtype = _read_npy_header(file)
+            offset = file.tell()
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                         order='F' if fortran_order else 'C')
+
+    def _map_compressed(self, info: zipfile.ZipInfo):
+        """Decompress a member in chunks into a temporary file and memory-map it."""
+        buffer = tempfile.TemporaryFile()
+        with zipfile.ZipFile(self.path) as archive, archive.open(info) as member:
+            shape, fortran_order, dtype = _read_npy_header(member)
+            shutil.copyfileobj(member, buffer, self.chunk_size)
+        buffer.flush()
+        return np.memmap(buffer, dtype=dtype, mode='r', offset=0, shape=shape,
+                         order='F' if fortran_order else 'C')
+
+
+def _read_npy_header(file):
+    """Read the header of a .npy stream and return shape, fortran_order and dtype."""
+    version = np.lib.format.read_magic(file)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(file)
+    return np.lib.format.read_array_header_2_0(file)
+
+
+def load_cross_section(path: str):
+    """
+    Open a river cross-section file with the y, z and u layout of cross_section.npz without reading it.
+
+    Args:
+        path (str): Path of the .npz file.
+
+    Returns:
+        LazyNpz: Mapping with the lazily memory-mapped arrays 'y', 'z' and 'u'.
+    """
+    section = LazyNpz(path)
+    for name in ('y', 'z', 'u'):
+        if name not in section:
+            raise ValueError(f"{path} does not contain the array '{name}'.")
+    return section
+
+
+# Number of leading and trailing zero bits of every byte value (bits ordered as by np.packbits)
+_LEADING_ZEROS = np.array([8] + [7 - int(np.log2(value)) for value in range(1, 256)], dtype=np.int64)
+_TRAILING_ZEROS = np.array([8] + [(value & -value).bit_length() - 1 for value in range(1, 256)], dtype=np.int64)
+
+
+def wetted_bounds(mask: np.ndarray):
+    """
+    Index of the first and the last wetted cell of every column of a wetted-cell mask.
+
+    The mask is packed into bits (8 cells per byte), so each column is scanned as bytes, and the
+    position inside the first and last non-zero byte comes from a lookup table.
+
+    Args:
+        mask (np.ndarray): Boolean array of shape (..., ny, nz), True where the cell is wet.
+
+    Returns:
+        tuple: first, last (integer arrays of shape (..., ny), -1 for dry columns), wet (boolean
+               array of shape (..., ny), False for dry columns).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    n_z = mask.shape[-1]
+    packed = np.packbits(mask, axis=-1)
+    nonzero = packed != 0
+    wet = np.any(nonzero, axis=-1)
+
+    first_byte = np.argmax(nonzero, axis=-1)
+    last_byte = packed.shape[-1] - 1 - np.argmax(nonzero[..., ::-1], axis=-1)
+    first_value = np.take_along_axis(packed, first_byte[..., np.newaxis], axis=-1)[..., 0]
+    last_value = np.take_along_axis(packed, last_byte[..., np.newaxis], axis=-1)[..., 0]
+
+    first = np.where(wet, 8 * first_byte + _LEADING_ZEROS[first_value], -1)
+    last = np.where(wet, np.minimum(8 * last_byte + 7 - _TRAILING_ZEROS[last_value], n_z - 1), -1)
+    return first, last, wet
+
+
+def _cell_widths(points: np.ndarray):
+    """Width of the cell around every grid point: the distance between the neighbouring midpoints (full spacing at the ends)."""
+    midpoints = (points[1:] + points[:-1]) / 2.0
+    edges = np.concatenate(([2.0 * points[0] - midpoints[0]], midpoints, [2.0 * points[-1] - midpoints[-1]]))
+    return np.diff(edges)
+
+
+def section_depth(y: np.ndarray, z: np.ndarray, mask: np.ndarray, surface: float = 0.0):
+    """
+    Depth profile, cross-section area and cell-area weights of one or many river sections.
+
+    The river bed of a column is the grid point just below its first wetted cell, as in exercise 6
+    (the lowest grid point if the whole column is wet); dry columns have zero depth. The grids may
+    be non-uniform.
+
+    Args:
+        y (np.ndarray): Grid across the river, shape (ny,).
+        z (np.ndarray): Vertical grid, increasing upwards, shape (nz,).
+        mask (np.ndarray): Boolean array of shape (..., ny, nz), True where the cell is wet; leading
+                           axes stack several sections on the same grid.
+        surface (float): Height of the free surface.
+
+    Returns:
+        tuple: depth (shape (..., ny)), area (shape (...), trapezoidal rule of the depth along y),
+               cell_weights (shape (ny, nz), area of the cell around every grid point, so that the
+               volume flux is np.sum(cell_weights * u) and the wetted area np.sum(cell_weights * mask)).
+    """
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    mask = np.asarray(mask, dtype=bool)
+    if mask.shape[-2:] != (len(y), len(z)):
+        raise ValueError("The last two axes of mask must match the lengths of y and z.")
+
+    first, last, wet = wetted_bounds(mask)
+    bed = z[np.maximum(first - 1, 0)]
+    depth = np.where(wet, surface - bed, 0.0)
+
+    dy = np.diff(y)
+    area = np.sum(dy * (depth[..., 1:] + depth[..., :-1]) / 2.0, axis=-1)
+    cell_weights = _cell_widths(y)[:, np.newaxis] * _cell_widths(z)[np.newaxis, :]
+    return depth, area, cell_weights
+
+
+def section_properties(y: np.ndarray, z: np.ndarray, u: np.ndarray):
+    """
+    Depth profile, area, mean velocity and volume flux of a river cross-section (exercise 6).
+
+    Args:
+        y (np.ndarray): Grid across the river (uniform or not), shape (ny,).
+        z (np.ndarray): Vertical grid up to the free surface at z = 0 (uniform or not), shape (nz,).
+        u (np.ndarray): Streamwise velocity, zero outside the water, shape (ny, nz).
+
+    Returns:
+        tuple: depth (np.ndarray of shape (ny,)), area, mean_u, vol_flux_1 (direct sum of u dy dz)
+               and vol_flux_2 (mean velocity times wetted area).
+    """
+    u = np.asarray(u)
+    mask = (u != 0)
+    depth, area, cell_weights = section_depth(y, z, mask)
+
+    mean_u = np.mean(u[mask]) if np.any(mask) else 0.0
+    vol_flux_1 = np.sum(cell_weights * u)
+    vol_flux_2 = mean_u * np.sum(cell_weights[mask])
+    return depth, area, mean_u, vol_flux_1, vol_flux_2
+
+
+def _process_section_file(path: str):
+    """Worker of process_sections: load one section file and compute its properties."""
+    section = load_cross_section(path)
+    return section_properties(section['y'], section['z'], section['u'])
+
+
+SCALAR_COLUMNS = ('area', 'mean_u', 'vol_flux_1', 'vol_flux_2')
+
+
+def _read_results(output: str):
+    """Read an existing results file into a dict path -> (mtime, depth, scalar values)."""
+    if not os.path.exists(output):
+        return {}
+    with np.load(output) as results:
+        offsets = results['depth_offsets']
+        depth = results['depth']
+        scalars = np.column_stack([results[name] for name in SCALAR_COLUMNS])
+        return {path: (mtime, depth[offsets[k]:offsets[k + 1]], tuple(scalars[k]))
+                for k, (path, mtime) in enumerate(zip(results['path'], results['mtime']))}
+
+
+def _write_results(output: str, records: dict):
+    """Write the records (path -> (mtime, depth, scalar values)) as a columnar .npz file."""
+    paths = sorted(records)
+    depths = [records[path][1] for path in paths]
+    scalars = np.array([records[path][2] for path in paths], dtype=float).reshape(len(paths), len(SCALAR_COLUMNS))
+    results = {'path': np.array(paths, dtype=str),
+               'mtime': np.array([records[path][0] for path in paths], dtype=float),
+               'depth': np.concatenate(depths) if depths else np.array([]),
+               'depth_offsets': np.concatenate(([0], np.cumsum([len(depth) for depth in depths]))).astype(np.int64),
+               **{name: scalars[:, k] for k, name in enumerate(SCALAR_COLUMNS)}}
+
+    # Write to a temporary file first, so an interrupted run never leaves a corrupt results file
+    temporary = output + '.tmp'
+    with open(temporary, 'wb') as file:
+        np.savez(file, **results)
+    os.replace(temporary, output)
+    return results
+
+
+def process_sections(sections, output: str, max_workers=None, chunksize: int = 8, batch_size: int = 1024):
+    """
+    Process many river cross-section files on a process pool and store the results in one columnar file.
+
+    The output is a .npz file with one array per column: 'path', 'mtime' (modification time of the
+    section file), 'area', 'mean_u', 'vol_flux_1', 'vol_flux_2', and the depth profiles of all sections
+    concatenated in 'depth', with section k in depth[depth_offsets[k]:depth_offsets[k + 1]].
+    The file is updated after every batch of sections. Sections that are already in the output with
+    the same modification time are skipped, so an interrupted or extended survey can simply be
+    processed again.
+    On platforms that start worker processes by spawning (Windows, macOS), call this function
+    from inside an ``if __name__ == '__main__':`` block.
+
+    Args:
+        sections: Directory of .npz section files, a glob pattern, or a list of paths.
+        output (str): Path of the results .npz file.
+        max_workers: Number of worker processes (None uses all CPUs, 1 runs serially in this process).
+        chunksize (int): Number of sections sent to a worker at once.
+        batch_size (int): Number of sections processed between two updates of the output file.
+
+    Returns:
+        dict: The columns of the results file.
+    """
+    if isinstance(sections, str):
+        pattern = os.path.join(sections, '*.npz') if os.path.isdir(sections) else sections
+        paths = glob.glob(pattern)
+    else:
+        paths = list(sections)
+    paths = sorted({os.path.abspath(path) for path in paths} - {os.path.abspath(output)})
+    mtimes = {path: os.path.getmtime(path) for path in paths}
+
+    # Keep the results of sections that have not changed since they were processed
+    records = {path: record for path, record in _read_results(output).items()
+               if path in mtimes and record[0] == mtimes[path]}
+    todo = [path for path in paths if path not in records]
+
+    results = None
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers != 1 and todo else None
+    try:
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            if executor is None:
+                batch_results = map(_process_section_file, batch)
+            else:
+                batch_results = executor.map(_process_section_file, batch, chunksize=chunksize)
+            for path, (depth, *values) in zip(batch, batch_results):
+                records[path] = (mtimes[path], np.asarray(depth, dtype=float), tuple(values))
+            results = _write_results(output, records)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if results is None:
+        results = _write_results(output, records)
+    return results
+
+
+SNAPSHOT_INDEX_DTYPE = np.dtype([('time', '<f8'), ('offset', '<i8'), ('vol_flux', '<f8'), ('mean_u', '<f8')])
+
+
+class SectionTimeSeries:
+    """
+    Append-only on-disk store of repeated surveys u(t, y, z) of one cross-section on a shared y/z grid.
+
+    The store is a directory with three files:
+
+    - grid.npz: the y and z grids;
+    - u.bin: the raw float64 snapshots, one after another;
+    - index.bin: one record per snapshot with its time, byte offset in u.bin, volume flux and mean velocity.
+
+    Snapshots are read through memory maps, so any snapshot is accessed in O(1) without reading the
+    others. The volume-flux and mean-velocity time series are updated as each snapshot is appended.
+    A snapshot only becomes visible once its index record is written, after the snapshot data.
+    """
+
+    def __init__(self, path: str, y: np.ndarray = None, z: np.ndarray = None):
+        """
+        Open an existing store, or create a new one if y and z are given.
+
+        Args:
+            path (str): Directory of the store.
+            y (np.ndarray): Grid across the river (only to create a new store).
+            z (np.ndarray): Vertical grid up to the free surface at z = 0 (only to create a new store).
+        """
+        self.path = path
+        grid_file = os.path.join(path, 'grid.npz')
+        if y is not None or z is not None:
+            if os.path.exists(grid_file):
+                raise FileExistsError(f"A store already exists in {path}.")
+            os.makedirs(path, exist_ok=True)
+            np.savez(grid_file, y=np.asarray(y, dtype=float), z=np.asarray(z, dtype=float))
+            open(os.path.join(path, 'u.bin'), 'wb').close()
+            open(os.path.join(path, 'index.bin'), 'wb').close()
+
+        with np.load(grid_file) as grid:
+            self.y = grid['y']
+            self.z = grid['z']
+        self.shape = (len(self.y), len(self.z))
+        self._cell_weights = section_depth(self.y, self.z, np.zeros(self.shape, dtype=bool))[2]
+
+    def _index(self):
+        """Memory map of the snapshot index (an empty array if there are no snapshots)."""
+        index_file = os.path.join(self.path, 'index.bin')
+        n_records = os.path.getsize(index_file) // SNAPSHOT_INDEX_DTYPE.itemsize
+        if n_records == 0:
+            return np.zeros(0, dtype=SNAPSHOT_INDEX_DTYPE)
+        return np.memmap(index_file, dtype=SNAPSHOT_INDEX_DTYPE, mode='r', shape=(n_records,))
+
+    def __len__(self):
+        return len(self._index())
+
+    def __getitem__(self, k: int):
+        """Memory-mapped, read-only view of snapshot k (negative indices count from the end)."""
+        index = self._index()
+        offset = int(index[k]['offset'])
+        return np.memmap(os.path.join(self.path, 'u.bin'), dtype='<f8', mode='r', offset=offset, shape=self.shape)
+
+    @property
+    def times(self):
+        """Times of the snapshots."""
+        return np.asarray(self._index()['time'])
+
+    @property
+    def vol_flux(self):
+        """Volume flux of every snapshot."""
+        return np.asarray(self._index()['vol_flux'])
+
+    @property
+    def mean_u(self):
+        """Mean velocity over the wetted cells of every snapshot."""
+        return np.asarray(self._index()['mean_u'])
+
+    def append(self, time: float, u: np.ndarray):
+        """
+        Append a snapshot and update the volume-flux and mean-velocity time series.
+
+        Args:
+            time (float): Time of the survey; must be later than the last stored time.
+            u (np.ndarray): Streamwise velocity on the store grid, zero outside the water.
+        """
+        u = np.ascontiguousarray(u, dtype='<f8')
+        if u.shape != self.shape:
+            raise ValueError(f"u must have the shape {self.shape} of the store grid.")
+        times = self.times
+        if len(times) > 0 and time <= times[-1]:
+            raise ValueError("Snapshots must be appended in increasing order of time.")
+
+        mask = (u != 0)
+        mean_u = np.mean(u[mask]) if np.any(mask) else 0.0
+        vol_flux = np.sum(self._cell_weights * u)
+
+        # Write the data first and the index record last
+        offset = len(times) * u.nbytes
+        with open(os.path.join(self.path, 'u.bin'), 'r+b') as file:
+            file.seek(offset)
+            file.write(u.tobytes())
+        record = np.array([(time, offset, vol_flux, mean_u)], dtype=SNAPSHOT_INDEX_DTYPE)
+        with open(os.path.join(self.path, 'index.bin'), 'ab') as file:
+            file.write(record.tobytes())
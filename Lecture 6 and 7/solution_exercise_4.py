@@ -146,6 +146,52 @@ plt.legend()
 # plt.xscale('log'); plt.yscale('log')
 
 plt.show()
+
+#%% The same error study for many more values of n, without a Python loop over n
+# sweep_integration_errors concatenates the grids of all n and reduces each method per grid
+
+from integration_1d import river_bed_depth, sweep_integration_errors
+
+n_values = np.arange(2, 10001)
+errors, labels = sweep_integration_errors(river_bed_depth, xbounds, n_values, area_theo, grid='quadratic')
+
+plt.figure()
+for i in range(len(labels)):
+    plt.plot(n_values, errors[i, :], label=labels[i])
+plt.xlabel('n')
+plt.ylabel('Absolute error (m^2)')
+plt.title('Integration error for different values of n')
+plt.xscale('log'); plt.yscale('log')
+plt.legend()
+plt.show()
   
     
-    
\ No newline at end of file
+    
+#%% Streaming integration: the samples arrive in chunks and are never held in memory all at once
+# Here the chunks come from a generator; iterate_npy_chunks does the same for a pair of .npy files
+
+from integration_1d import river_bed_depth, stream_integrate
+
+def quadratic_grid_chunks(n, chunk_size):
+    for start in range(0, n, chunk_size):
+        s = np.arange(start, min(start + chunk_size, n)) / (n - 1)
+        x = xbounds[0] + s**2 * (xbounds[1] - xbounds[0])
+        yield x, river_bed_depth(x)
+
+area_6, area_8, area_9 = stream_integrate(quadratic_grid_chunks(1000000, 65536), f=river_bed_depth)
+print('Streamed area from method 6:    ' + '{:.09f}'.format(area_6) + ' m^2')
+print('Streamed area from method 8:    ' + '{:.09f}'.format(area_8) + ' m^2')
+print('Streamed area from method 9:    ' + '{:.09f}'.format(area_9) + ' m^2\n')
+
+#%% Many integrands on the same grid: build the weight vector once, then integrate with one matrix-vector product
+
+from grids import grid_points
+from integration_1d import grid_weights, integrate_with_weights
+
+x = grid_points(1001, xbounds, grid='quadratic')
+weights = grid_weights(x, rule='trapezoid')         # same as the dx vector of method 8
+
+amplitudes = np.linspace(5.0, 15.0, 10000)          # a family of bed profiles 5 + a*sin(x)
+profiles = 5.0 + amplitudes[:, np.newaxis] * np.sin(x)
+areas = integrate_with_weights(weights, profiles)
+print('Largest error over ' + str(len(amplitudes)) + ' profiles: ' + '{:.03e}'.format(np.max(np.abs(areas - (5.0*np.pi + 2.0*amplitudes)))) + ' m^2')
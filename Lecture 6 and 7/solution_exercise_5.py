@@ -75,9 +75,29 @@ print(f'The numerically computed average velocity is {v_avg_numerical_1:.4f} m/s
 v_avg_numerical_2 = np.mean(u[r <= R])
 print(f'Computed average velocity using np.mean is {v_avg_numerical_2:.4f} m/s')
 
+
+# Method 3 - quasi-Monte Carlo: random low-discrepancy points in the bounding box instead of a grid
+from pipe_flow import hagen_poiseuille_velocity, qmc_integrate_2d
+
+area, total_flow, area_ci, flow_ci, n_points = qmc_integrate_2d(
+    lambda x, y: np.sqrt(x**2 + y**2) <= R,                                 # inside the pipe
+    lambda x, y: hagen_poiseuille_velocity(np.sqrt(x**2 + y**2), R, u_max), # velocity to integrate
+    [[-R, R], [-R, R]], rtol=1e-4, seed=0)
+v_avg_numerical_3 = total_flow / area
+print(f'Quasi-Monte Carlo average velocity is {v_avg_numerical_3:.4f} m/s (area {area:.5f} +/- {area_ci:.1e} m^2, {n_points:d} points)')
+
+
+# Method 4 - cut cells: each cell is weighted by the exact fraction of its area inside the pipe
+from pipe_flow import circle_cell_fractions, cut_cell_average_velocity
+
+fractions = circle_cell_fractions(x, y, R)
+v_avg_numerical_4, area, total_flow = cut_cell_average_velocity(x, y, R, u_max, fractions)
+print(f'Cut-cell average velocity is {v_avg_numerical_4:.4f} m/s (area {area:.5f} m^2, exact {np.pi * R**2:.5f} m^2)')
+
 #%% COnvergence plot
 
 error = []
+error_cut_cell = []
 Nstart = 3
 Nmax = 101
 for N in range(Nstart,Nmax):
@@ -96,8 +116,13 @@ for N in range(Nstart,Nmax):
     
     error.append( np.abs( (total_flow / area) - (u_max / 2.0) ) )
     
+    v_avg_cut_cell = cut_cell_average_velocity(x, y, R, u_max)[0]
+    error_cut_cell.append( np.abs( v_avg_cut_cell - (u_max / 2.0) ) )
+    
 # Plot the error
-plt.plot(range(Nstart,Nmax), error)
+plt.plot(range(Nstart,Nmax), error, label='Method 1')
+plt.plot(range(Nstart,Nmax), error_cut_cell, label='Cut cells')
+plt.legend()
 plt.xlabel("Grid Resolution (N)")
 plt.ylabel("Error in Average Velocity")
 plt.title("Error in Numerical vs. Theoretical Average Velocity")
@@ -1,8 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from river_section import load_cross_section
 
 ### Load Variables
-cross_section = np.load('cross_section.npz')
+# load_cross_section works like np.load, but memory-maps the arrays instead of reading them,
+# so only the parts that are used are read from disk (np.load('cross_section.npz') also works)
+cross_section = load_cross_section('cross_section.npz')
 y = cross_section['y']
 z = cross_section['z']
 u = cross_section['u']
@@ -33,6 +36,13 @@ for ii in range(len(y)):
 mask = (u != 0)
 depth = -z[np.argmax(mask, axis=1)-1]
 
+# The vectorized version assumes that every column has water in it and that dy and dz are constant.
+# section_depth also handles dry and fully wet columns, non-uniform y and z, and stacks of sections
+from river_section import section_depth
+
+depth2, area2, cell_weights = section_depth(y, z, mask)
+print('Largest difference between the two depth profiles: ' + '{:.04f}'.format(np.max(np.abs(depth2 - depth))))
+
 plt.figure()
 plt.plot(y, depth)
 plt.xlabel('y')
@@ -62,8 +72,41 @@ vol_flux_2 = np.mean(u[mask]) * np.sum(mask)*dy*dz      # avg_u * area
 print('Volume flux is: ' + '{:.04f}'.format(vol_flux_2) + ' (calculation 2)')
 
 
+#%% Repeated surveys of the same section: an append-only store with one file for all snapshots
+# Here the survey is repeated with a synthetic tidal modulation of the measured velocity
 
+import os
+import tempfile
+from river_section import SectionTimeSeries
 
+with tempfile.TemporaryDirectory() as store_dir:
+    series = SectionTimeSeries(os.path.join(store_dir, 'surveys'), y, z)
+    for time in np.arange(0.0, 12.0 * 3600.0, 600.0):
+        series.append(time, u * (1.0 + 0.2 * np.sin(2.0 * np.pi * time / (12.42 * 3600.0))))
 
+    print('Number of stored snapshots: ' + str(len(series)))
+    print('Volume flux of snapshot 10: ' + '{:.04f}'.format(np.sum(dy * dz * series[10])))
+    times, vol_flux = np.array(series.times), np.array(series.vol_flux)   # copies, the store is deleted below
 
+plt.figure()
+plt.plot(times / 3600.0, vol_flux)
+plt.xlabel('Time (h)')
+plt.ylabel('Volume flux')
+plt.show()
 
+#%% Many sections: process all section files matching a pattern
+# The results go to one columnar file; sections that are already in it are skipped on a rerun
+# (here the results file is written to a temporary directory, so the second call is the rerun).
+# process_sections can spread the files over a process pool (max_workers=None); that needs the
+# call to be inside an if __name__ == '__main__': block, so this cell processes them serially
+
+import os
+import tempfile
+from river_section import process_sections
+
+with tempfile.TemporaryDirectory() as output_dir:
+    results_file = os.path.join(output_dir, 'section_results.npz')
+    process_sections('cross_section*.npz', results_file, max_workers=1)
+    results = process_sections('cross_section*.npz', results_file, max_workers=1)
+for path, area, mean_u, vol_flux in zip(results['path'], results['area'], results['mean_u'], results['vol_flux_1']):
+    print(f'{path}: area {area:.4f}, average velocity {mean_u:.4f}, volume flux {vol_flux:.4f}')
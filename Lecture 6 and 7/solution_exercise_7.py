@@ -73,6 +73,21 @@ total_flow = np.sum(cell_area[mask] * u[:-1, :-1][mask])
 v_avg_numerical3 = total_flow / area
 print(f'The numerically computed average velocity is {v_avg_numerical3:.4f} m/s')
 
+# Method 3 can also be written without the cell_area matrix and the boolean-indexed copies,
+# by contracting the mask and u directly with the 1D vectors of dx and dy
+from pipe_flow import masked_cell_sums
+
+area, total_flow = masked_cell_sums(np.diff(x), np.diff(y), mask, u[:-1, :-1])
+print(f'The numerically computed average velocity is {total_flow / area:.4f} m/s')
+
+# Or store only the points inside the pipe: the velocity is computed, averaged and compared
+# on flat arrays, and only scattered back onto the grid for plotting
+from pipe_flow import CompactField, hagen_poiseuille_velocity
+
+pipe = CompactField(x, y, R)
+u_pipe = hagen_poiseuille_velocity(np.sqrt(pipe.x**2 + pipe.y**2), R, u_max)
+print(f'The numerically computed average velocity is {pipe.average(u_pipe):.4f} m/s')
+
 
 # Method 4
 x1 = np.linspace(-R, R, Nx)
@@ -87,6 +102,15 @@ u1 = griddata(points, u_values, (X1, Y1), method='linear')   # Interpolation usi
 v_avg_numerical4 = np.mean(u1[r1 <= R])
 print(f'The numerically computed average velocity is {v_avg_numerical4:.4f} m/s')
 
+# griddata triangulates the scattered points, although the grid is already rectilinear.
+# A tensor-product (bilinear) interpolation on the 1D x and y vectors is much cheaper,
+# and its weights are cached, so interpolating further fields on the same grids is only a gather
+from pipe_flow import interpolate_rectilinear
+
+u1 = interpolate_rectilinear(x, y, u, x1, y1, method='linear')
+v_avg_numerical4 = np.mean(u1[r1 <= R])
+print(f'The numerically computed average velocity is {v_avg_numerical4:.4f} m/s')
+
 #%% Visualization of velocity field
 
 # Mask velocity outside the pipe cross-section with nan i.e. set values outside r=R to nan
@@ -150,9 +174,7 @@ for N in range(Nstart,Nmax):
     X1, Y1 = np.meshgrid(x1, y1, indexing='ij')
     r1 = np.sqrt(X1**2 + Y1**2)
 
-    points = np.array([X.ravel(), Y.ravel()]).T                  # Flattened coordinate points from non-uniform grid
-    u_values = u.ravel()                                         # Flattened velocity values
-    u1 = griddata(points, u_values, (X1, Y1), method='linear')   # Interpolation using griddata
+    u1 = interpolate_rectilinear(x, y, u, x1, y1, method='linear')   # Tensor-product interpolation, no triangulation
     v_avg_numerical4 = np.mean(u1[r1 <= R])
     error4.append( np.abs( v_avg_numerical4 - (u_max / 2.0) ) )
     
@@ -166,3 +188,37 @@ plt.ylabel("Absolute error in average velocity calculation")
 plt.grid(True)
 plt.legend()
 plt.show()
+
+#%% Convergence study up to much larger N, with timings and observed orders of convergence
+# run_convergence_study can spread the cases over a process pool (max_workers=None); that needs the
+# call to be inside an if __name__ == '__main__': block, so this cell runs the cases serially
+
+from functools import partial
+from pipe_flow import avg_velocity_mean, avg_velocity_cells, avg_velocity_interpolated, run_convergence_study
+
+methods = [partial(avg_velocity_mean, R=R, u_max=u_max, grid='tanh'),     # Method 1
+           partial(avg_velocity_cells, R=R, u_max=u_max, grid='tanh'),    # Method 3
+           partial(avg_velocity_interpolated, R=R, u_max=u_max)]          # Method 4
+N_values = np.unique(np.geomspace(3, 2000, 60).astype(int))
+errors, timings, rates = run_convergence_study(methods, N_values, u_max / 2.0, max_workers=1)
+
+plt.figure()
+for label, error, rate in zip(['Method 1', 'Method 3', 'Method 4'], errors, rates):
+    plt.plot(N_values, error, label=f'{label} (observed order {rate:.2f})')
+plt.xscale('log'); plt.yscale('log')
+plt.xlabel("Grid Resolution (N)")
+plt.ylabel("Absolute error in average velocity calculation")
+plt.grid(True)
+plt.legend()
+plt.show()
+print(f'Total run time of all cases: {np.sum(timings):.1f} s')
+
+#%% Very large grids: method 3 evaluated in blocks of rows, without ever building the full meshgrid
+
+from pipe_flow import tanh_grid, pipe_flow_row_blocks
+
+N = 20000
+x = tanh_grid(R, N)
+y = tanh_grid(R, N)
+area, total_flow = pipe_flow_row_blocks(x, y, R, u_max, max_memory=256 * 2**20)   # at most ~256 MB of temporaries
+print(f'The numerically computed average velocity on a {N:d} x {N:d} grid is {total_flow / area:.6f} m/s')
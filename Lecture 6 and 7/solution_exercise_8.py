@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from pipe_flow import compute_avg_velocity_value, pipe_geometry, polar_avg_velocity, sweep_avg_velocity
 
 #%% Function definitation
 
@@ -7,20 +8,23 @@ def compute_avg_velocity(mu, dpdx, R, Nx, Ny, lmeshplot, lvelplot):
     
     print(f'Inputs: mu = {mu:.4f} Pa-s, dpdx = {dpdx:.4f} Pa/m, R =  {R:.4f} m, Nx = {Nx:d}, Ny = {Ny:d}')
 
+    # The numerical calculation is done by a function without printing or plotting (see pipe_flow.py)
+    v_avg_numerical, v_avg_theory = compute_avg_velocity_value(mu, dpdx, R, Nx, Ny)
+    print(f'Theoretical average velocity is {v_avg_theory:.4f} m/s')
+    print(f'The numerically computed average velocity is {v_avg_numerical:.4f} m/s\n')
+
+    if lmeshplot == True or lvelplot == True:
+        plot_pipe_flow(mu, dpdx, R, Nx, Ny, lmeshplot, lvelplot)
+
+    return v_avg_numerical
+
+
+def plot_pipe_flow(mu, dpdx, R, Nx, Ny, lmeshplot, lvelplot):
+
     u_max = -dpdx * R**2 / (4 * mu)    # Maximum velocity at the center
-    print(f'Theoretical average velocity is {(u_max / 2.0):.4f} m/s')
 
-    # Mesh generation
-    
-    # Define x-axis in the cross-section
-    linear_space = np.linspace(-1, 1, Nx)               # Define a uniform grid between -1 and 1 with Nx data points
-    x = np.tanh(2 * linear_space * np.arctanh(R))       # Convert the linear uniform mesh to a non-uniform using tanh functions
-    x = ( x/np.max(x) ) * R                             # Normalize appropriately to map between -R to R
-    
-    # Define x-axis in the cross-section
-    linear_space = np.linspace(-1, 1, Ny)
-    y = np.tanh(2 * linear_space * np.arctanh(R))
-    y = ( y/np.max(y) ) * R
+    # Mesh generation: the same cached tanh grids as used for the average velocity (see pipe_flow.py)
+    x, y, _ = pipe_geometry(R, Nx, Ny)
     
     X, Y = np.meshgrid(x, y, indexing='ij')     # Create a 2D grid for the cross-section
     
@@ -59,18 +63,6 @@ def compute_avg_velocity(mu, dpdx, R, Nx, Ny, lmeshplot, lvelplot):
         plt.xticks(np.arange(0, 11, 2))
         plt.yticks(np.arange(-0.5, 0.55, 0.25))
         plt.show()
-    
-    # Calculation of the average velocity through the duct
-    dx = np.diff(x)[:, np.newaxis]  # Differences along the x-direction
-    dy = np.diff(y)[np.newaxis, :]  # Differences along the y-direction
-    cell_area = dx * dy
-    
-    mask = r[:-1, :-1] <= R
-    
-    area = np.sum(cell_area[mask])
-    total_flow = np.sum(cell_area[mask] * u[:-1, :-1][mask])
-    v_avg_numerical = total_flow / area
-    print(f'The numerically computed average velocity is {v_avg_numerical:.4f} m/s\n')
 
 #%% Call the functions as many times as you need
 
@@ -100,4 +92,25 @@ Nx = 505                  # Number of grid points along x
 Ny = 507                  # Number of grid points along y
 lmeshplot = False
 lvelplot = True
-compute_avg_velocity(mu, dpdx, R, Nx, Ny, lmeshplot, lvelplot)
\ No newline at end of file
+compute_avg_velocity(mu, dpdx, R, Nx, Ny, lmeshplot, lvelplot)
+
+
+#%% Polar quadrature: Gauss points in r and equally spaced points in theta, all inside the pipe
+
+v_avg_polar, v_avg_theory = polar_avg_velocity(mu, dpdx, R, n_r=8, n_theta=16)
+print(f'Average velocity with 8 x 16 polar quadrature points is {v_avg_polar:.6f} m/s (theory {v_avg_theory:.6f} m/s)\n')
+
+
+#%% Parameter sweep: many cases, results collected in a structured array
+# sweep_avg_velocity can spread the cases over a process pool (max_workers=None); that needs the
+# call to be inside an if __name__ == '__main__': block, so this cell runs the cases serially
+
+mu_values = np.array([0.001, 0.005, 0.025])
+dpdx_values = np.array([-0.1, -0.4, -0.8])
+R_values = np.array([0.2, 0.5])
+cases = [(mu_i, dpdx_i, R_i, 105, 107) for mu_i in mu_values for dpdx_i in dpdx_values for R_i in R_values]
+
+results = sweep_avg_velocity(cases, max_workers=1)
+for case in results:
+    print(f"mu = {case['mu']:.4f}, dpdx = {case['dpdx']:.4f}, R = {case['R']:.4f}: "
+          f"numerical {case['v_avg_numerical']:.4f} m/s, theoretical {case['v_avg_theory']:.4f} m/s")
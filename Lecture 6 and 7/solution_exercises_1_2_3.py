@@ -118,6 +118,53 @@ plt.legend()
 # plt.xscale('log'); plt.yscale('log')
 
 plt.show()
+
+#%% The same error study for many more values of n, without a Python loop over n
+# sweep_integration_errors concatenates the grids of all n and reduces each method per grid
+
+from integration_1d import river_bed_depth, sweep_integration_errors
+
+n_values = np.arange(2, 10001)
+errors, labels = sweep_integration_errors(river_bed_depth, xbounds, n_values, area_theo)
+
+plt.figure()
+for i in range(len(labels)):
+    plt.plot(n_values, errors[i, :], label=labels[i])
+plt.xlabel('n')
+plt.ylabel('Absolute error (m^2)')
+plt.title('Integration error for different values of n')
+plt.xscale('log'); plt.yscale('log')
+plt.legend()
+plt.show()
   
     
-    
\ No newline at end of file
+    
+#%% Romberg integration: reuse the trapezoidal samples of every refinement and extrapolate the error away
+
+from integration_1d import river_bed_depth, romberg_integrate
+
+area_romberg, error_estimate, n_evaluations = romberg_integrate(river_bed_depth, xbounds, tol=1e-12)
+print('Area from Romberg integration: ' + '{:.012f}'.format(area_romberg) + ' m^2')
+print('Estimated error: ' + '{:.03e}'.format(error_estimate) + ', true error: ' + '{:.03e}'.format(abs(area_romberg - area_theo)))
+print('Number of function evaluations: ' + str(n_evaluations))
+
+#%% Higher-order rules: composite Simpson and Gauss-Legendre need far fewer samples for the same error
+
+from integration_1d import river_bed_depth, composite_simpson, composite_gauss_legendre
+
+for n in [5, 11, 21]:
+    area_simpson = composite_simpson(river_bed_depth, xbounds, n)
+    print('Simpson rule with n = ' + str(n) + ': error = ' + '{:.03e}'.format(abs(area_simpson - area_theo)) + ' m^2')
+
+for n_intervals in [1, 2, 4]:
+    area_gauss = composite_gauss_legendre(river_bed_depth, xbounds, n_intervals, order=5)
+    print('Gauss-Legendre rule with ' + str(5*n_intervals) + ' points: error = ' + '{:.03e}'.format(abs(area_gauss - area_theo)) + ' m^2')
+
+#%% Adaptive integration: refine only where the local error estimate is large (no exact area needed)
+
+from integration_1d import river_bed_depth, adaptive_integrate
+
+area_adaptive, error_estimate, n_evaluations = adaptive_integrate(river_bed_depth, xbounds, tol=1e-10)
+print('Area from adaptive integration: ' + '{:.010f}'.format(area_adaptive) + ' m^2')
+print('Estimated error: ' + '{:.03e}'.format(error_estimate) + ', true error: ' + '{:.03e}'.format(abs(area_adaptive - area_theo)))
+print('Number of function evaluations: ' + str(n_evaluations))
@@ -1,16 +1,29 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 import matplotlib.pyplot as plt
 
 
-def compute_taylor_green_theory(x: np.ndarray, y: np.ndarray, time: float, viscosity: float):
+def compute_taylor_green_theory(x: np.ndarray, y: np.ndarray, time: float, viscosity: float,
+                                out=None, axes: bool = False):
     """
     Compute the velocity field of the Taylor-Green vortex using theoretical expressions.
 
+    All fields are products of a function of x and a function of y. On a tensor grid
+    (the 1D axes with axes=True, or a 2D np.meshgrid with indexing='ij') sin and cos are
+    only evaluated on the 1D axes and the 2D fields are formed as scaled outer products.
+    Any other input is evaluated pointwise.
+
     Args:
-        x (np.ndarray): X-coordinates (2D grid).
-        y (np.ndarray): Y-coordinates (2D grid).
+        x (np.ndarray): X-coordinates (2D grid, any array broadcastable with y, or the 1D x axis if axes=True).
+        y (np.ndarray): Y-coordinates (2D grid, any array broadcastable with x, or the 1D y axis if axes=True).
         time (float): Time at which to evaluate the velocity field (s).
         viscosity (float): Kinematic viscosity of the fluid (m²/s).
+        out (tuple, optional): Five preallocated arrays of the output shape to write
+                               u, v, vel_magnitude, vorticity and psi into.
+        axes (bool): If True, x and y are the 1D axes of an (Nx, Ny) grid.
 
     Returns:
         tuple: u (x-velocity field), v (y-velocity field), vel_magnitude (velocity magnitude field), 
@@ -21,21 +34,157 @@ def compute_taylor_green_theory(x: np.ndarray, y: np.ndarray, time: float, visco
     if time < 0:
         raise ValueError("Time must be non-negative.")
 
+    decay = np.exp(-2.0 * viscosity * time)
+
+    # 1D axes of a tensor grid, if any
+    if axes:
+        if np.ndim(x) != 1 or np.ndim(y) != 1:
+            raise ValueError("With axes=True, x and y must be 1D arrays.")
+        x_axis, y_axis = np.asarray(x), np.asarray(y)
+    elif (np.ndim(x) == 2 and np.shape(x) == np.shape(y)
+          and not np.ptp(x, axis=1).any() and not np.ptp(y, axis=0).any()):
+        x_axis, y_axis = x[:, 0], y[0, :]
+    else:
+        x_axis = y_axis = None
+
+    if x_axis is None:
+        # Pointwise evaluation
+        if out is None:
+            u = np.sin(x) * np.cos(y) * decay
+            v = - np.cos(x) * np.sin(y) * decay
+            vel_magnitude = np.sqrt(u**2 + v**2)
+            psi = np.sin(x) * np.sin(y) * decay
+            vorticity = 2.0 * psi
+            return u, v, vel_magnitude, vorticity, psi
+
+        u, v, vel_magnitude, vorticity, psi = out
+        np.multiply(np.sin(x), np.cos(y), out=u)
+        u *= decay
+        np.multiply(np.cos(x), np.sin(y), out=v)
+        v *= -decay
+        np.hypot(u, v, out=vel_magnitude)
+        np.multiply(np.sin(x), np.sin(y), out=psi)
+        psi *= decay
+        np.multiply(psi, 2.0, out=vorticity)
+        return u, v, vel_magnitude, vorticity, psi
+
+    if out is None:
+        out = tuple(np.empty((len(x_axis), len(y_axis))) for _ in range(5))
+    elif len(out) != 5 or any(array.shape != (len(x_axis), len(y_axis)) for array in out):
+        raise ValueError("out must hold five arrays of shape (Nx, Ny).")
+    u, v, vel_magnitude, vorticity, psi = out
+
+    # 1D modes: the only transcendental function evaluations
+    sin_x, cos_x = np.sin(x_axis), np.cos(x_axis)
+    sin_y, cos_y = np.sin(y_axis), np.cos(y_axis)
+
     # Velocity of Taylor Green system 
-    u = np.sin(x) * np.cos(y) * np.exp(-2.0 * viscosity * time)
-    v = - np.cos(x) * np.sin(y) * np.exp(-2.0 * viscosity * time)
-    vel_magnitude = np.sqrt(u**2 + v**2)
+    np.multiply.outer(decay * sin_x, cos_y, out=u)
+    np.multiply.outer(-decay * cos_x, sin_y, out=v)
+    np.hypot(u, v, out=vel_magnitude)
     
     # Stream function
-    psi = np.sin(x) * np.sin(y) * np.exp(-2.0 * viscosity * time)
+    np.multiply.outer(decay * sin_x, sin_y, out=psi)
     
     # Vorticity field of Taylor Green system 
-    vorticity = 2.0 * np.sin(x) * np.sin(y) * np.exp(-2.0 * viscosity * time)
+    np.multiply(psi, 2.0, out=vorticity)
 
     return u, v, vel_magnitude, vorticity, psi
 
 
-def compute_taylor_green_from_stream_stream(x: np.ndarray, y: np.ndarray, psi: np.ndarray):
+def iterate_taylor_green_theory(x: np.ndarray, y: np.ndarray, times, viscosity: float,
+                                out=None, axes: bool = False):
+    """
+    Lazily evaluate the theoretical Taylor-Green fields at a sequence of times.
+
+    Time only enters the solution through the decay factor exp(-2*nu*t), so the spatial
+    modes are computed once at t = 0 and each frame is a scaling of these modes.
+
+    Args:
+        x (np.ndarray): X-coordinates, as in compute_taylor_green_theory.
+        y (np.ndarray): Y-coordinates, as in compute_taylor_green_theory.
+        times (array_like): Times at which to evaluate the velocity field (s).
+        viscosity (float): Kinematic viscosity of the fluid (m²/s).
+        out (tuple, optional): Five preallocated arrays of the output shape. When given, every
+                               frame is written into (and yields) these same arrays, so the
+                               previous frame is overwritten at each step.
+        axes (bool): If True, x and y are the 1D axes of an (Nx, Ny) grid.
+
+    Yields:
+        tuple: time, u (x-velocity field), v (y-velocity field), vel_magnitude (velocity magnitude field), 
+               vorticity (vorticity field), psi (stream function).
+    """
+    times = np.asarray(times, dtype=float)
+    if times.ndim != 1:
+        raise ValueError("Times must be a 1D sequence.")
+    if np.any(times < 0):
+        raise ValueError("Time must be non-negative.")
+
+    # Spatial modes at t = 0 (unit decay factor)
+    modes = compute_taylor_green_theory(x, y, 0.0, viscosity, axes=axes)
+
+    for time in times:
+        decay = np.exp(-2.0 * viscosity * time)
+        if out is None:
+            frame = tuple(mode * decay for mode in modes)
+        else:
+            frame = tuple(np.multiply(mode, decay, out=array) for mode, array in zip(modes, out))
+        yield (time,) + frame
+
+
+@lru_cache(maxsize=None)
+def _spectral_wavenumbers(n: int, period: float):
+    """
+    Cached factors i*k of the rfft modes for differentiation of a periodic signal.
+
+    Args:
+        n (int): Number of samples in one period (without the duplicated endpoint).
+        period (float): Length of the period.
+
+    Returns:
+        np.ndarray: Read-only complex array of length n // 2 + 1.
+    """
+    ik = 1j * 2.0 * np.pi * np.fft.rfftfreq(n, d=period / n)
+    if n % 2 == 0:
+        ik[-1] = 0.0  # Nyquist mode has no well-defined derivative
+    ik.setflags(write=False)
+    return ik
+
+
+def _spectral_derivative(field: np.ndarray, coord: np.ndarray, axis: int):
+    """
+    Differentiate a periodic field along one axis with the FFT.
+
+    The grid along the axis must be uniform and span exactly one period with the
+    endpoint included, as produced by np.linspace(0, 2*np.pi, N), so the first and the
+    last samples of the field along the axis must be equal.
+
+    Args:
+        field (np.ndarray): Field defined on the 2D grid.
+        coord (np.ndarray): 1D coordinates along the differentiation axis.
+        axis (int): Axis along which to differentiate.
+
+    Returns:
+        np.ndarray: Derivative of the field along the axis.
+    """
+    n = len(coord) - 1
+    period = coord[-1] - coord[0]
+    if n < 2 or not np.allclose(np.diff(coord), period / n):
+        raise ValueError("Spectral differentiation requires a uniform grid of at least three points.")
+
+    field = np.moveaxis(field, axis, -1)
+    if not np.allclose(field[..., 0], field[..., -1], rtol=1e-8, atol=1e-8 * np.max(np.abs(field))):
+        raise ValueError("Spectral differentiation requires a periodic field sampled with the endpoint included.")
+
+    # Drop the duplicated periodic endpoint, differentiate, then restore it
+    periodic = field[..., :-1]
+    derivative = np.fft.irfft(np.fft.rfft(periodic, axis=-1) * _spectral_wavenumbers(n, period), n=n, axis=-1)
+    derivative = np.concatenate([derivative, derivative[..., :1]], axis=-1)
+
+    return np.moveaxis(derivative, -1, axis)
+
+
+def compute_taylor_green_from_stream_stream(x: np.ndarray, y: np.ndarray, psi: np.ndarray, method: str = 'gradient'):
     """
     Compute the velocity field from the stream function of the Taylor-Green vortex.
 
@@ -43,23 +192,155 @@ def compute_taylor_green_from_stream_stream(x: np.ndarray, y: np.ndarray, psi: n
         x (np.ndarray): X-coordinates (2D grid).
         y (np.ndarray): Y-coordinates (2D grid).
         psi (np.ndarray): Stream function defined on the 2D grid.
+        method (str): 'gradient' for second-order finite differences (np.gradient), or 'spectral'
+                      for FFT differentiation on a uniform grid spanning one period with the endpoint included.
 
     Returns:
         tuple: u (x-velocity field), v (y-velocity field), 
                vel_magnitude (velocity magnitude field), vorticity (vorticity field).
     """
+    if method == 'gradient':
+        derivative = np.gradient
+    elif method == 'spectral':
+        derivative = _spectral_derivative
+    else:
+        raise ValueError("Method must be either 'gradient' or 'spectral'.")
 
     # Velocity components from stream function
-    u = np.gradient(psi, y[0,:], axis=1)  # del_psi/del_y
-    v = -np.gradient(psi, x[:,0], axis=0) # -del_psi/del_x
+    u = derivative(psi, y[0,:], axis=1)  # del_psi/del_y
+    v = -derivative(psi, x[:,0], axis=0) # -del_psi/del_x
     vel_magnitude = np.sqrt(u**2 + v**2)
     
     # Vorticity = del_v/del_x - del_u/del_y
-    vorticity = np.gradient(v, x[:,0], axis=0) - np.gradient(u, y[0,:], axis=1)
+    vorticity = derivative(v, x[:,0], axis=0) - derivative(u, y[0,:], axis=1)
 
     return u, v, vel_magnitude, vorticity
 
 
+def _first_difference_into(field: np.ndarray, spacing: float, axis: int, out: np.ndarray):
+    """
+    Write the first derivative of a field on a uniform grid into a preallocated array.
+
+    Uses central differences in the interior and one-sided differences at the two
+    boundaries, identical to np.gradient with the default edge_order=1.
+
+    Args:
+        field (np.ndarray): Field defined on the 2D grid.
+        spacing (float): Uniform grid spacing along the axis.
+        axis (int): Axis along which to differentiate.
+        out (np.ndarray): Array of the same shape as field receiving the derivative.
+    """
+    f = np.moveaxis(field, axis, 0)
+    d = np.moveaxis(out, axis, 0)
+    np.subtract(f[2:], f[:-2], out=d[1:-1])
+    d[1:-1] *= 0.5 / spacing
+    np.subtract(f[1], f[0], out=d[0])
+    np.subtract(f[-1], f[-2], out=d[-1])
+    d[0] /= spacing
+    d[-1] /= spacing
+
+
+def _second_difference_into(field: np.ndarray, spacing: float, axis: int, out: np.ndarray):
+    """
+    Write the second derivative of a field on a uniform grid into a preallocated array.
+
+    Uses the three-point central stencil in the interior and the second-order one-sided
+    four-point stencil (2f0 - 5f1 + 4f2 - f3)/h^2 at the two boundaries.
+
+    Args:
+        field (np.ndarray): Field defined on the 2D grid.
+        spacing (float): Uniform grid spacing along the axis.
+        axis (int): Axis along which to differentiate.
+        out (np.ndarray): Array of the same shape as field receiving the derivative.
+    """
+    f = np.moveaxis(field, axis, 0)
+    d = np.moveaxis(out, axis, 0)
+    np.subtract(f[2:], f[1:-1], out=d[1:-1])
+    d[1:-1] -= f[1:-1]
+    d[1:-1] += f[:-2]
+    d[1:-1] *= 1.0 / spacing**2
+    for edge, step in ((0, 1), (-1, -1)):
+        np.multiply(f[edge], 2.0, out=d[edge])
+        d[edge] -= 5.0 * f[edge + step]
+        d[edge] += 4.0 * f[edge + 2 * step]
+        d[edge] -= f[edge + 3 * step]
+        d[edge] *= 1.0 / spacing**2
+
+
+class StreamFunctionStencil:
+    """
+    Finite-difference evaluation of velocity and vorticity from a stream function with a
+    reusable workspace.
+
+    All output and scratch arrays are allocated once for the grid and overwritten on every
+    call, so repeated evaluations on the same grid do not allocate new full-size arrays.
+    The stencils are those of the README (central in the interior, one-sided at the
+    boundaries), so the results match compute_taylor_green_from_stream_stream.
+
+    Args:
+        x (np.ndarray): X-coordinates (2D grid from np.meshgrid with indexing='ij', or the 1D x axis).
+        y (np.ndarray): Y-coordinates (2D grid from np.meshgrid with indexing='ij', or the 1D y axis).
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        x_axis = x[:, 0] if np.ndim(x) == 2 else np.asarray(x)
+        y_axis = y[0, :] if np.ndim(y) == 2 else np.asarray(y)
+        if len(x_axis) < 4 or len(y_axis) < 4:
+            raise ValueError("The grid must have at least four points along each axis.")
+
+        self.dx = (x_axis[-1] - x_axis[0]) / (len(x_axis) - 1)
+        self.dy = (y_axis[-1] - y_axis[0]) / (len(y_axis) - 1)
+        if not (np.allclose(np.diff(x_axis), self.dx) and np.allclose(np.diff(y_axis), self.dy)):
+            raise ValueError("The stencil engine requires a uniform grid.")
+
+        self.shape = (len(x_axis), len(y_axis))
+        self.u = np.empty(self.shape)
+        self.v = np.empty(self.shape)
+        self.vel_magnitude = np.empty(self.shape)
+        self.vorticity = np.empty(self.shape)
+        self._scratch = np.empty(self.shape)
+
+    def __call__(self, psi: np.ndarray, vorticity_from: str = 'velocity'):
+        """
+        Compute the velocity field and vorticity from the stream function.
+
+        Args:
+            psi (np.ndarray): Stream function defined on the 2D grid.
+            vorticity_from (str): 'velocity' to differentiate the computed u and v (as
+                                  compute_taylor_green_from_stream_stream does), or 'laplacian'
+                                  to use the compact discrete Laplacian, vorticity = -(psi_xx + psi_yy).
+
+        Returns:
+            tuple: u (x-velocity field), v (y-velocity field), 
+                   vel_magnitude (velocity magnitude field), vorticity (vorticity field).
+                   These are the workspace arrays and are overwritten by the next call.
+        """
+        if psi.shape != self.shape:
+            raise ValueError("The stream function must be defined on the grid of the stencil.")
+
+        # Velocity components from stream function
+        _first_difference_into(psi, self.dy, 1, self.u)   # del_psi/del_y
+        _first_difference_into(psi, self.dx, 0, self.v)   # -del_psi/del_x
+        np.negative(self.v, out=self.v)
+        np.hypot(self.u, self.v, out=self.vel_magnitude)
+
+        if vorticity_from == 'velocity':
+            # Vorticity = del_v/del_x - del_u/del_y
+            _first_difference_into(self.v, self.dx, 0, self.vorticity)
+            _first_difference_into(self.u, self.dy, 1, self._scratch)
+            np.subtract(self.vorticity, self._scratch, out=self.vorticity)
+        elif vorticity_from == 'laplacian':
+            # Vorticity = -(del^2_psi/del_x^2 + del^2_psi/del_y^2)
+            _second_difference_into(psi, self.dx, 0, self.vorticity)
+            _second_difference_into(psi, self.dy, 1, self._scratch)
+            np.add(self.vorticity, self._scratch, out=self.vorticity)
+            np.negative(self.vorticity, out=self.vorticity)
+        else:
+            raise ValueError("vorticity_from must be either 'velocity' or 'laplacian'.")
+
+        return self.u, self.v, self.vel_magnitude, self.vorticity
+
+
 def compute_error(var_theory: np.ndarray, var: np.ndarray, var_name):
     """
     Compute the absolute error.
@@ -79,6 +360,106 @@ def compute_error(var_theory: np.ndarray, var: np.ndarray, var_name):
     return error
     
     
+def _tile_max_errors(x_axis: np.ndarray, y_axis: np.ndarray, x_tile: slice, y_tile: slice,
+                     time: float, viscosity: float, vorticity_from: str, halo: int, workspaces):
+    """
+    Maximum errors of the fields computed from the stream function on one tile of the grid.
+
+    The tile is extended by a halo on every side that is not a domain boundary, so the
+    central stencils inside the tile see the same neighbours as on the full grid. Small
+    tiles are widened to the four points the stencil engine needs. The stencil engine and
+    the theory buffers are kept per thread and per tile shape in workspaces (a threading.local),
+    so tiles of the same shape reuse the same arrays.
+
+    Returns:
+        np.ndarray: Maximum errors in u, v, velocity magnitude and vorticity on the tile.
+    """
+    def halo_window(tile, n):
+        start = max(tile.start - halo, 0)
+        stop = min(max(tile.stop + halo, start + 4), n)
+        return max(min(start, stop - 4), 0), stop
+
+    x_start, x_stop = halo_window(x_tile, len(x_axis))
+    y_start, y_stop = halo_window(y_tile, len(y_axis))
+    x_local, y_local = x_axis[x_start:x_stop], y_axis[y_start:y_stop]
+
+    if not hasattr(workspaces, 'by_shape'):
+        workspaces.by_shape = {}
+    shape = (len(x_local), len(y_local))
+    if shape not in workspaces.by_shape:
+        workspaces.by_shape[shape] = (StreamFunctionStencil(x_local, y_local),
+                                      tuple(np.empty(shape) for _ in range(5)))
+    stencil, theory_buffers = workspaces.by_shape[shape]
+
+    theory = compute_taylor_green_theory(x_local, y_local, time, viscosity, out=theory_buffers, axes=True)
+    numerical = stencil(theory[4], vorticity_from=vorticity_from)
+
+    # Crop the halo and compare u, v, vel_magnitude and vorticity (the theory buffers hold the errors afterwards)
+    inner = (slice(x_tile.start - x_start, x_tile.stop - x_start),
+             slice(y_tile.start - y_start, y_tile.stop - y_start))
+    max_errors = np.empty(4)
+    for k, (var_theory, var) in enumerate(zip(theory[:4], numerical)):
+        error = np.subtract(var_theory[inner], var[inner], out=var_theory[inner])
+        max_errors[k] = np.max(np.abs(error, out=error))
+    return max_errors
+
+
+def compute_tiled_max_errors(x: np.ndarray, y: np.ndarray, time: float, viscosity: float,
+                             tile_shape=(1024, 1024), vorticity_from: str = 'velocity', max_workers=None):
+    """
+    Compute the maximum errors of the fields obtained from the stream function tile by tile.
+
+    The psi -> (u, v, vorticity) -> error chain is evaluated on tiles with halos on a thread
+    pool (NumPy releases the GIL in its array operations), so only a few tiles are held in
+    memory at a time and the full 2D fields are never formed. The per-tile maxima are
+    combined into the maxima over the grid.
+
+    Args:
+        x (np.ndarray): X-coordinates (uniform 2D grid from np.meshgrid with indexing='ij', or the 1D x axis).
+        y (np.ndarray): Y-coordinates (uniform 2D grid from np.meshgrid with indexing='ij', or the 1D y axis).
+        time (float): Time at which to evaluate the velocity field (s).
+        viscosity (float): Kinematic viscosity of the fluid (m²/s).
+        tile_shape (tuple): Number of grid points of a tile along x and y.
+        vorticity_from (str): 'velocity' or 'laplacian', see StreamFunctionStencil.
+        max_workers (int, optional): Number of threads; defaults to the ThreadPoolExecutor default.
+
+    Returns:
+        dict: Maximum errors in u velocity, v velocity, velocity magnitude and vorticity.
+    """
+    if np.ndim(x) == 2 and np.ndim(y) == 2:
+        if np.ptp(x, axis=1).any() or np.ptp(y, axis=0).any():
+            raise ValueError("2D x and y must be a grid from np.meshgrid with indexing='ij'.")
+        x_axis, y_axis = x[:, 0], y[0, :]
+    else:
+        x_axis, y_axis = np.asarray(x), np.asarray(y)
+    for axis in (x_axis, y_axis):
+        if axis.ndim != 1 or len(axis) < 4 or not np.allclose(np.diff(axis), (axis[-1] - axis[0]) / (len(axis) - 1)):
+            raise ValueError("The tiled evaluation requires a uniform grid of at least four points along each axis.")
+    if min(tile_shape) < 1:
+        raise ValueError("Tile shape must be positive.")
+    if vorticity_from not in ('velocity', 'laplacian'):
+        raise ValueError("vorticity_from must be either 'velocity' or 'laplacian'.")
+
+    # Vorticity from the velocities differentiates psi twice with central stencils
+    halo = 2 if vorticity_from == 'velocity' else 1
+    tiles = [(slice(i, min(i + tile_shape[0], len(x_axis))), slice(j, min(j + tile_shape[1], len(y_axis))))
+             for i in range(0, len(x_axis), tile_shape[0])
+             for j in range(0, len(y_axis), tile_shape[1])]
+
+    # One stencil workspace and set of theory buffers per thread and tile shape
+    workspaces = threading.local()
+
+    max_errors = np.zeros(4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for tile_errors in executor.map(
+            lambda tile: _tile_max_errors(x_axis, y_axis, *tile, time, viscosity, vorticity_from, halo, workspaces),
+            tiles
+        ):
+            np.maximum(max_errors, tile_errors, out=max_errors)
+
+    return dict(zip(["u velocity", "v velocity", "velocity magnitude", "vorticity"], max_errors))
+
+
 def plot_field_with_quiver(x, y, u, v, F, title, climits, lquiver):
     """
     Plot the velocity field.
@@ -150,6 +531,28 @@ vel_mag_error = compute_error(vel_mag_theory, vel_mag_psi, "velocity magnitude")
 vorticity_error = compute_error(vorticity_theory, vorticity_psi, "vorticity")
 
 
+# Compute velocity from stream function with spectral (FFT) differentiation
+u_spectral, v_spectral, vel_mag_spectral, vorticity_spectral = compute_taylor_green_from_stream_stream(x, y, psi_theory, method='spectral')
+vorticity_spectral_error = compute_error(vorticity_theory, vorticity_spectral, "vorticity (spectral)")
+
+
+# Compute vorticity with the reusable stencil workspace, directly from the discrete Laplacian of psi
+stencil = StreamFunctionStencil(x, y)
+_, _, _, vorticity_laplacian = stencil(psi_theory, vorticity_from='laplacian')
+vorticity_laplacian_error = compute_error(vorticity_theory, vorticity_laplacian, "vorticity (Laplacian of psi)")
+
+
+# Maximum errors from a tiled, multi-threaded evaluation (same values, bounded memory on large grids)
+for var_name, max_error in compute_tiled_max_errors(x, y, time, viscosity, tile_shape=(16, 16)).items():
+    print("Maximum error in " + var_name + f" computation (tiled): {max_error:.6e}")
+
+
+# Decay of the theoretical peak velocity magnitude over time
+frame_buffers = tuple(np.empty_like(x) for _ in range(5))
+for frame_time, _, _, frame_vel_mag, _, _ in iterate_taylor_green_theory(x, y, np.linspace(0.0, 5.0, 6), viscosity, out=frame_buffers):
+    print(f"Peak velocity magnitude at t = {frame_time:.1f} s: {np.max(frame_vel_mag):.6e}")
+
+
 # Plot fields
 plot_field_with_quiver(x, y, u_theory, v_theory, u_theory, "Velocity Field u: theoretical [m/s]", clim, lquiver)
 plot_field_with_quiver(x, y, u_psi, v_psi, u_psi, "Velocity Field u: from stream function [m/s]", clim, lquiver)